@@ -1,3 +1,10 @@
+import sys
+from prism import profiling
+
+# Started before anything else is imported so every import is measured.
+PROFILER = profiling.StartupProfiler("--profile-startup" in sys.argv[1:])
+PROFILER.start()
+
 import logging
 import asyncio
 import contextvars
@@ -7,7 +14,7 @@ import sdl2.ext
 import sdl2.sdlttf
 from prism.menu_scene import MenuScene
 from prism.scene_manager import SceneManager
-from prism import dialogue_scene, overworld_scene, menu_scene, battle_scene, pokebelt_scene
+from prism import fonts, dialogue_scene, overworld_scene, menu_scene, battle_scene, pokebelt_scene
 
 
 def main():
@@ -18,30 +25,47 @@ def main():
         format="%(levelname)s:%(relativeCreated)d:%(module)s:%(message)s")
     logging.getLogger("PIL").setLevel(69)  # turn off PIL logging
 
-    sdl2.ext.init()
-    logging.debug("SDL2 video system initialized")
-    sdl2.sdlttf.TTF_Init()
-    logging.debug("SDL2 font system initialized")
+    with PROFILER.measure("startup", "SDL video and font init"):
+        sdl2.ext.init()
+        logging.debug("SDL2 video system initialized")
+        sdl2.sdlttf.TTF_Init()
+        logging.debug("SDL2 font system initialized")
 
-    window = sdl2.ext.Window("Pokemon Prism", size=(800, 700))
-    window.show()
+    with PROFILER.measure("startup", "window"):
+        window = sdl2.ext.Window("Pokemon Prism", size=(800, 700))
+        window.show()
 
     uiprocessor = sdl2.ext.UIProcessor()
-    scene_manager = SceneManager(window)
-
-    #TODO Initialize scenes
-    scene_manager.overworld = overworld_scene.make_overworld_scene(
-        scene_manager)
-    scene_manager.dialogue = dialogue_scene.make_dialogue_scene(scene_manager)
-    scene_manager.menu = menu_scene.make_menu_scene(scene_manager)
-    scene_manager.battle = battle_scene.make_battle_scene(scene_manager)
-    scene_manager.belt = pokebelt_scene.make_pokebelt_scene(scene_manager)
-    
-    scene_manager.set_scene_to_active(scene_manager.overworld)
-    scene_manager.spriterenderer.render(
-        scene_manager.current_scene.renderables())
+    with PROFILER.measure("startup", "scene manager"):
+        scene_manager = SceneManager(window)
+
+    # Scenes are built on first use; only the overworld is needed to show
+    # the first frame. The rest are warmed one per frame by game_loop.
+    scene_manager.register_scene("overworld",
+                                 overworld_scene.make_overworld_scene)
+    scene_manager.register_scene("dialogue", dialogue_scene.make_dialogue_scene)
+    scene_manager.register_scene("menu", menu_scene.make_menu_scene)
+    scene_manager.register_scene("battle", battle_scene.make_battle_scene)
+    scene_manager.register_scene("belt", pokebelt_scene.make_pokebelt_scene)
+
+    with PROFILER.measure("scene", "overworld"):
+        scene_manager.get_scene("overworld")
+
+    with PROFILER.measure("startup", "first frame"):
+        scene_manager.set_scene_to_active(scene_manager.overworld)
+        scene_manager.renderer.render(scene_manager.renderables())
+
+    if PROFILER.enabled:
+        for name in scene_manager.pending_scenes():
+            with PROFILER.measure("scene", f"{name} (deferred)"):
+                scene_manager.get_scene(name)
+        PROFILER.report()
+        PROFILER.stop()
+        fonts.close_all()
+        return
 
     asyncio.run(game_loop(scene_manager, uiprocessor, window))
+    fonts.close_all()
 
 
 target_fps = contextvars.ContextVar('target_fps', default=60)
@@ -67,14 +91,14 @@ async def game_loop(scene_manager: SceneManager,
                         event.key.keysym.sym)
         if scene_manager.active_event:
             scene_manager.run_event()
-        if scene_manager.current_scene == scene_manager.dialogue:
+        if scene_manager.scene_is_current("dialogue"):
             if scene_manager.current_scene.printing_dialogue and scene_manager.frame_count % scene_manager.current_scene.dialogue_speed == 0 and scene_manager.current_scene.not_waiting():
                 scene_manager.current_scene.full_render()                        
-        elif scene_manager.current_scene == scene_manager.overworld:
+        elif scene_manager.scene_is_current("overworld"):
             scene_manager.current_scene.check_for_player_movement()
             scene_manager.current_scene.check_for_actor_movement()
             scene_manager.current_scene.full_render()
-        elif scene_manager.current_scene == scene_manager.battle:
+        elif scene_manager.scene_is_current("battle"):
             if scene_manager.current_scene.enemy_ticking_health or scene_manager.current_scene.player_ticking_health:
                 p_poke = scene_manager.current_scene.player_pokemon
                 e_poke = scene_manager.current_scene.enemy_pokemon
@@ -102,9 +126,8 @@ async def game_loop(scene_manager: SceneManager,
             elif scene_manager.current_scene.executing_turn:
                 scene_manager.current_scene.execution_loop()
             
-        scene_manager.spriterenderer.render(
-            scene_manager.renderables())
-        window.refresh()
+        scene_manager.renderer.render(scene_manager.renderables())
+        scene_manager.warm_next_scene()
         done = time.monotonic()
         elapsed_time = start - done
         
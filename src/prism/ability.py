@@ -3,11 +3,76 @@ from typing import Tuple, Dict, Optional
 from PIL import Image
 from .stat import Stat
 from . import ptypes
+from .assets import get_image_from_path
 import importlib.resources
 
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
+CLASS_SPRITE_NAMES = ("physical.png", "special.png", "status.png")
+
+
+def type_sprite_name(ptype: ptypes.PokemonType) -> str:
+    return ptype.name.lower() + ".png"
+
+
+def plate_name(ptype: ptypes.PokemonType) -> str:
+    return ptype.name.lower() + "_button.png"
+
+
+@enum.unique
+class DamageClass(enum.IntEnum):
+    PHYSICAL = 0
+    SPECIAL = 1
+    STATUS = 2
+
+
+class TypePresentation:
+    """Type icon and move plate shared by every move of one type."""
+    ptype: ptypes.PokemonType
+    type_sprite_name: str
+    plate_name: str
+
+    def __init__(self, ptype: ptypes.PokemonType):
+        self.ptype = ptype
+        self.type_sprite_name = type_sprite_name(ptype)
+        self.plate_name = plate_name(ptype)
+
+    @property
+    def type_sprite(self) -> Image.Image:
+        return get_image_from_path(self.type_sprite_name)
+
+    @property
+    def plate(self) -> Image.Image:
+        return get_image_from_path(self.plate_name)
+
+
+class ClassPresentation:
+    """Damage class icon shared by every move of one class."""
+    damage_class: DamageClass
+    sprite_name: str
+
+    def __init__(self, damage_class: DamageClass):
+        self.damage_class = damage_class
+        self.sprite_name = CLASS_SPRITE_NAMES[damage_class]
+
+    @property
+    def sprite(self) -> Image.Image:
+        return get_image_from_path(self.sprite_name)
+
+
+type_presentations: dict[ptypes.PokemonType, TypePresentation] = {}
+class_presentations: dict[DamageClass, ClassPresentation] = {}
+
+
+def get_type_presentation(ptype: ptypes.PokemonType) -> TypePresentation:
+    if ptype not in type_presentations:
+        type_presentations[ptype] = TypePresentation(ptype)
+    return type_presentations[ptype]
+
+
+def get_class_presentation(damage_class: DamageClass) -> ClassPresentation:
+    if damage_class not in class_presentations:
+        class_presentations[damage_class] = ClassPresentation(damage_class)
+    return class_presentations[damage_class]
+
 
 @enum.unique
 class AbilityType(enum.IntEnum):
@@ -42,9 +107,9 @@ class Ability:
     tags: list[str]
     priority: int
     accuracy: int
-    ability_plate: Image.Image
-    ability_type_sprite: Image.Image
-    ability_class_sprite: Image.Image
+    damage_class: DamageClass
+    type_presentation: TypePresentation
+    class_presentation: ClassPresentation
 
     def __init__(self, name: str, ptype: ptypes.PokemonType, accuracy: Optional[int], max_pp: int, priority: int,
                  target: TargetingType, atype: Tuple[AbilityType],
@@ -52,8 +117,7 @@ class Ability:
         self.name = name
         self.accuracy = accuracy
         self.ptype = ptype
-
-        self.ability_type_sprite = get_image_from_path(ptype.name.lower() + ".png")
+        self.type_presentation = get_type_presentation(ptype)
 
         self.atype = {}
 
@@ -63,22 +127,49 @@ class Ability:
         self.current_pp = max_pp
         self.priority = priority
 
-        self.ability_plate = get_image_from_path(ptype.name.lower() + "_button.png")
-
         for i, abi_type in enumerate(atype):
             self.atype[abi_type] = []
             self.atype[abi_type].append(effects[i])
 
         if AbilityType.DAMAGE in self.atype:
             if self.atype[AbilityType.DAMAGE][0][1] == Stat.ATK:
-                self.ability_class_sprite = get_image_from_path("physical.png")
+                self.damage_class = DamageClass.PHYSICAL
             elif self.atype[AbilityType.DAMAGE][0][1] == Stat.SPATK:
-                self.ability_class_sprite = get_image_from_path("special.png")
+                self.damage_class = DamageClass.SPECIAL
+            else:
+                raise ValueError(
+                    f"{name}: damage must scale with ATK or SPATK, not "
+                    f"{self.atype[AbilityType.DAMAGE][0][1]!r}")
         else:
-            self.ability_class_sprite = get_image_from_path("status.png")
+            self.damage_class = DamageClass.STATUS
+        self.class_presentation = get_class_presentation(self.damage_class)
 
         self.tags = []
         self.tags.extend(args)
+
+    @property
+    def type_sprite_name(self) -> str:
+        return self.type_presentation.type_sprite_name
+
+    @property
+    def plate_name(self) -> str:
+        return self.type_presentation.plate_name
+
+    @property
+    def class_sprite_name(self) -> str:
+        return self.class_presentation.sprite_name
+
+    @property
+    def ability_type_sprite(self) -> Image.Image:
+        return self.type_presentation.type_sprite
+
+    @property
+    def ability_plate(self) -> Image.Image:
+        return self.type_presentation.plate
+
+    @property
+    def ability_class_sprite(self) -> Image.Image:
+        return self.class_presentation.sprite
     
     def expend_pp(self):
         self.current_pp -= 1
\ No newline at end of file
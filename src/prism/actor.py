@@ -5,13 +5,12 @@ import importlib.resources
 
 from prism.pokemon import pokespawn
 from prism.trainer import Trainer
+from prism.assets import get_image_from_path
 if typing.TYPE_CHECKING:
     from prism.overworld_scene import OverworldScene
-    from prism.areamap import Tile, AreaMap
+    from prism.areamap import AreaMap
 
-def get_image_from_path(file_name: str) -> Image.Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
+DEFAULT_SIGHT_RANGE = 4
 
 def default_dialogue(scene: "OverworldScene"):
     scene.scene_manager.start_dialogue("I have nothing to say to you! Why do you keep coming back here wondering if I'll have something to say? AAAAAAA AAA? AAAAAAAAAA AAA AA A AAAAAAAAAAA AAAAAAAAAAAAAAA")
@@ -32,7 +31,8 @@ def default_battle_script(challenge_dialogue: str) -> Callable:
             scene.scene_manager.event_phase = 2
             
         elif scene.scene_manager.event_phase == 2:
-            if scene.scene_manager.current_scene != scene.scene_manager.dialogue:
+            if not scene.scene_manager.scene_is_current("dialogue"):
+                actor.spotted_player = True
                 scene.scene_manager.start_battle(scene.player, actor.trainer)
                 return True
     return battle_script
@@ -57,7 +57,7 @@ class Actor:
     dest_y: int
     dialogue_script: Optional[Callable]
     movement_script: Optional[Callable]
-    image: Image.Image
+    image_name: str
     position: Tuple[int, int]
     x_movement_remaining: int
     y_movement_remaining: int
@@ -70,10 +70,13 @@ class Actor:
     interactable: bool
     battle_ready: bool
     aggressive: bool
+    facing: Tuple[int, int]
+    sight_range: int
+    spotted_player: bool
     trainer: Optional["Trainer"]
     battle_script: Optional[Callable]
 
-    def __init__(self, image: str, position: Tuple[int, int], movement: Optional[Callable] = None, dialogue: Optional[Callable] = None, trainer: Optional[Trainer] = None, battle: Optional[Callable] = None, aggressive: bool = False, battle_ready: bool = False):
+    def __init__(self, image: str, position: Tuple[int, int], movement: Optional[Callable] = None, dialogue: Optional[Callable] = None, trainer: Optional[Trainer] = None, battle: Optional[Callable] = None, aggressive: bool = False, battle_ready: bool = False, facing: Tuple[int, int] = (0, 1), sight_range: int = DEFAULT_SIGHT_RANGE):
         self.interactable = True
         self.movement_speed = 8
         self.movement_phase = 1
@@ -84,6 +87,9 @@ class Actor:
         self.bonking = False
         self.battle_ready = battle_ready
         self.aggressive = aggressive
+        self.facing = facing
+        self.sight_range = sight_range
+        self.spotted_player = False
         self.trainer = trainer
         if movement:
             self.movement_script = movement
@@ -91,7 +97,7 @@ class Actor:
             self.movement_script = None
         self.position = position
         self.dest_x, self.dest_y = self.position
-        self.image = get_image_from_path(image)
+        self.image_name = image
         if dialogue:
             self.dialogue_script = dialogue
         else:
@@ -102,6 +108,10 @@ class Actor:
         else:
             self.battle_script = None
 
+    @property
+    def image(self) -> Image.Image:
+        return get_image_from_path(self.image_name)
+
 test_trainer = Trainer("Test Trainer", [pokespawn("mismagius", 15, ["shadow_ball", "flamethrower"]),pokespawn("slowbro", 20, ["scald",])])
 
 
@@ -1,28 +1,44 @@
 from typing import Tuple
 import enum
-from prism import actor
+from prism import actor, mapfile
 from prism.portal import Portal
 from prism.mapname import MapName
 from prism.actor import Actor, actor_db
 from prism.actor import move_actor
+from prism.assets import get_image_from_path
+from prism.atlas import Atlas, shared_atlas
+from prism.engine import free_when_unreferenced, image_to_surface
+from prism.spatial import SightlineIndex, SpatialHash
 import sdl2.ext
 import sdl2
 import enum
 from PIL import Image
 from sdl2 import endian
 import importlib.resources
+import array
+import collections
+import copy
+import threading
 import typing
-from typing import Optional, Callable
+from typing import Optional, Callable, Iterator
+
+TILE_SIZE = 40
+CHUNK_TILES = 16
+CHUNK_SIZE = CHUNK_TILES * TILE_SIZE
+MAX_GROUND_CHUNKS = 32
+
+# Bits of the flag byte each MapChunk keeps per tile.
+WALKABLE = 0x1
+ITEM = 0x2
+OCCUPIED = 0x4
+PLAYER_OCCUPIED = 0x8
+PASSABLE_MASK = WALKABLE | ITEM | OCCUPIED
 
 if typing.TYPE_CHECKING:
     from prism.player import Player
     from prism.overworld_scene import OverworldScene
 
 
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
-
 def default_pickup(scene: "OverworldScene", item: "Item"):
     scene.player.pick_up_item(item)
     print(f"You picked up {item.name}!")
@@ -30,7 +46,7 @@ def default_pickup(scene: "OverworldScene", item: "Item"):
 
 def test_event_pickup(scene: "OverworldScene", item: "Item"):
     scene.event_running = True
-    actor = item.actors[0]
+    actor = scene.current_map.placed(item.actors[0])
     scene.player.pick_up_item(item)
     if not actor.movement_script:
         def test_event_movement(scene: "OverworldScene", actor: Actor):
@@ -44,7 +60,7 @@ def test_event_pickup(scene: "OverworldScene", item: "Item"):
                 actor.movement_phase = 4
 
             if actor.movement_phase == 4:
-                if scene.scene_manager.current_scene != scene.scene_manager.dialogue:
+                if not scene.scene_manager.scene_is_current("dialogue"):
                     response = scene.scene_manager.stored_prompt
                     print(response)
                     if response == "Go Away":
@@ -64,99 +80,127 @@ def test_event_pickup(scene: "OverworldScene", item: "Item"):
         actor.movement_script = test_event_movement
 
 class Item:
-    image: Image
+    image_name: str
     name: str
     pickup_script: Callable
     actors: list[Actor]
     def __init__(self, path: str, name: str, pickup_script: Callable = default_pickup, actors: list[Actor] = []):
-        self.image = get_image_from_path(path)
+        self.image_name = path
         self.name = name
         self.pickup_script = pickup_script
         self.actors = actors
 
+    @property
+    def image(self) -> Image.Image:
+        return get_image_from_path(self.image_name)
+
 item_db = {
     "test_item": Item("test_item.png", "test item", pickup_script=test_event_pickup, actors=[actor_db[1]])
 }
 
-class Tile:
-    image: Image.Image
+def world_atlas() -> Atlas:
+    """Items and actors drawn by the overworld. Tiles are baked into each
+    map's ground layer instead."""
+    return shared_atlas("world", lambda: (
+        [item.image_name for item in item_db.values()] +
+        [actor.image_name for actor in actor_db.values()]))
+
+
+class TileType:
+    """What every tile built from one tile_db entry has in common. Shared by
+    all positions of that type, in every map, and never mutated."""
+    __slots__ = ("type_id", "image_name", "walkable", "dest_areamap",
+                 "dest_portal", "dest_offset", "entry_map_offset", "item",
+                 "ramp_direction")
+    type_id: int
+    image_name: str
     walkable: bool
-    grid_x: int
-    grid_y: int
-    true_x: int
-    true_y: int
-    dest_x: int
-    dest_y: int
-    x_movement_remaining: int
-    y_movement_remaining: int
     dest_areamap: Optional[MapName]
     dest_portal: Optional[Portal]
     dest_offset: Tuple[int, int]
     entry_map_offset: Tuple[int, int]
     item: Optional[Item]
     ramp_direction: Optional[Tuple[int, int]]
-    occupied: bool
-    player_occupied: bool
-    actor: Optional[Actor]
-
-    def __init__(self, **attributes):
-        self.image = get_image_from_path(attributes["image"])
-        if "walkable" in attributes:
-            self.walkable = attributes["walkable"]
-        else:
-            self.walkable = True
-
-        if "dest_areamap" in attributes:
-            self.dest_areamap = attributes["dest_areamap"]
-        else:
-            self.dest_areamap = None
-
-        if "dest_portal" in attributes:
-            self.dest_portal = attributes["dest_portal"]
-        else:
-            self.dest_portal = None
-
-        if "dest_offset" in attributes:
-            self.dest_offset = attributes["dest_offset"]
-        else:
-            self.dest_offset = (0, 0)
-
-        if "entry_map_offset" in attributes:
-            self.entry_map_offset = attributes["entry_map_offset"]
-        else:
-            self.entry_map_offset = (200, 200)
-
-        if "item" in attributes:
-            self.item = attributes["item"]
-        else:
-            self.item = None
-
-        if "ramp_direction" in attributes:
-            self.ramp_direction = attributes["ramp_direction"]
-        else:
-            self.ramp_direction = None
-        self.occupied = False
-        self.player_occupied = False
-        self.y_movement_remaining = 40
-        self.x_movement_remaining = 40
-        self.actor = None
+
+    def __init__(self, type_id: int, **attributes):
+        self.type_id = type_id
+        self.image_name = attributes["image"]
+        self.walkable = attributes.get("walkable", True)
+        self.dest_areamap = attributes.get("dest_areamap")
+        self.dest_portal = attributes.get("dest_portal")
+        self.dest_offset = attributes.get("dest_offset", (0, 0))
+        self.entry_map_offset = attributes.get("entry_map_offset", (200, 200))
+        self.item = attributes.get("item")
+        self.ramp_direction = attributes.get("ramp_direction")
+
+    @property
+    def image(self) -> Image.Image:
+        return get_image_from_path(self.image_name)
+
+
+class TileRef:
+    """View of one map position: its TileType plus the item and actor its
+    AreaMap stores for that position. Cheap to create and not retained."""
+    __slots__ = ("area_map", "grid_x", "grid_y", "tile_type")
+    area_map: "AreaMap"
+    grid_x: int
+    grid_y: int
+    tile_type: TileType
+
+    def __init__(self, area_map: "AreaMap", grid_x: int, grid_y: int):
+        self.area_map = area_map
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.tile_type = area_map.tile_type((grid_x, grid_y))
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self.grid_x, self.grid_y
 
     @property
-    def x(self):
-        if self.dest_x > self.grid_x:
-            return (self.grid_x * 40) + (40 - self.x_movement_remaining)
-        return self.grid_x * 40 - (40 - self.x_movement_remaining)
+    def image_name(self) -> str:
+        return self.tile_type.image_name
 
     @property
-    def y(self):
-        if self.dest_y > self.grid_y:
-            return (self.grid_y * 40) + (40 - self.y_movement_remaining)
-        return self.grid_y * 40 - (40 - self.y_movement_remaining)
+    def image(self) -> Image.Image:
+        return self.tile_type.image
+
+    @property
+    def walkable(self) -> bool:
+        return self.tile_type.walkable
+
+    @property
+    def dest_areamap(self) -> Optional[MapName]:
+        return self.tile_type.dest_areamap
+
+    @property
+    def dest_portal(self) -> Optional[Portal]:
+        return self.tile_type.dest_portal
+
+    @property
+    def dest_offset(self) -> Tuple[int, int]:
+        return self.tile_type.dest_offset
+
+    @property
+    def entry_map_offset(self) -> Tuple[int, int]:
+        return self.tile_type.entry_map_offset
+
+    @property
+    def ramp_direction(self) -> Optional[Tuple[int, int]]:
+        return self.tile_type.ramp_direction
+
+    @property
+    def item(self) -> Optional[Item]:
+        return self.area_map.items.get(self.position)
 
     @property
     def has_item(self):
         return self.item
 
+    @property
+    def actor(self) -> Optional[Actor]:
+        return self.area_map.actor_index.at(self.position)
+
 tile_db = {
     0: {
         "image": "test_grass_tile.png"
@@ -195,13 +239,83 @@ tile_db = {
     13: {"image": "test_grass_tile.png", "ramp_direction": (1, -1)}
 }
 
+tile_types = {
+    type_id: TileType(type_id, **attributes)
+    for type_id, attributes in tile_db.items()
+}
+
+# Stands in for every tile of a chunk that is not loaded.
+VOID_TILE = TileType(-1, image="test_rock_tile.png", walkable=False)
+
+# Foreground image files by id; decoded through the asset cache when a map
+# that uses them is loaded.
 fg_db = {
-    0: get_image_from_path("test_rock_foreground.png")
+    0: "test_rock_foreground.png"
 }
 
-class AreaMap:
+class GroundChunkCache:
+    """LRU of baked ground chunks shared by every map, so ground memory is
+    bounded by the cache size rather than by the size of the world. An
+    evicted chunk surface is freed once no sprite still draws it."""
+    max_chunks: int
+    hits: int
+    misses: int
+    _chunks: collections.OrderedDict
+    _lock: threading.Lock
+
+    def __init__(self, max_chunks: int = MAX_GROUND_CHUNKS):
+        self.max_chunks = max_chunks
+        self.hits = 0
+        self.misses = 0
+        self._chunks = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, area_map: "AreaMap", chunk_x: int,
+            chunk_y: int) -> sdl2.SDL_Surface:
+        key = (area_map, chunk_x, chunk_y)
+        with self._lock:
+            surface = self._chunks.get(key)
+            if surface is not None:
+                self.hits += 1
+                self._chunks.move_to_end(key)
+                return surface
+            self.misses += 1
+        baked = free_when_unreferenced(
+            image_to_surface(area_map.bake_chunk(chunk_x, chunk_y)))
+        with self._lock:
+            surface = self._chunks.get(key)
+            if surface is not None:
+                self._chunks.move_to_end(key)
+                return surface
+            self._chunks[key] = baked
+            while len(self._chunks) > self.max_chunks:
+                self._chunks.popitem(last=False)
+            return baked
+
+
+GROUND_CHUNKS = GroundChunkCache()
+
+
+class MapChunk:
+    """Tile ids and flags of one resident CHUNK_TILES square of a map."""
+    __slots__ = ("tile_ids", "flags")
+    tile_ids: array.array
+    flags: bytearray
+
+    def __init__(self, tile_ids: array.array, flags: bytearray):
+        self.tile_ids = tile_ids
+        self.flags = flags
+
 
-    map: list[list[Tile]]
+class AreaMap:
+    """A map whose grid is streamed in CHUNK_TILES squares from read_chunk.
+
+    Only resident chunks hold tile ids and flags. Tiles in chunks that are
+    not loaded read as VOID_TILE with no flags set, so they are never
+    walkable. Items taken, actor positions and the player's tiles are kept
+    per map and reapplied whenever a chunk is loaded again. Once a map has
+    been read, its chunks, flags, actor index and sightlines are only
+    changed on the main thread."""
     width: int
     height: int
     x_offset: int
@@ -210,94 +324,349 @@ class AreaMap:
     portals: dict[Portal, Tuple[int, int]]
     foreground_items: dict[Tuple[int, int], Image.Image]
     actors: list[Actor]
-
-    def __init__(self, map: list[list[int]], offset: Tuple[int, int]):
-        self.map = []
-        for i, row in enumerate(map):
-            map_row = []
-            for j, info in enumerate(row):
-                tile = Tile(**tile_db[info])
-                tile.grid_x = j
-                tile.grid_y = i
-                tile.dest_x = j
-                tile.dest_y = i
-                tile.true_x = j
-                tile.true_y = i
-                map_row.append(tile)
-            self.map.append(map_row)
-        self.height = len(self.map[0])
-        self.width = len(self.map)
+    placed_actors: dict[Actor, Actor]
+    exits: dict[Tuple[int, int], MapName]
+    chunks: dict[Tuple[int, int], MapChunk]
+    items: dict[Tuple[int, int], Item]
+    taken_items: set[Tuple[int, int]]
+    actor_index: SpatialHash
+    sightlines: SightlineIndex
+    player_tiles: set[Tuple[int, int]]
+    read_chunk: Callable[[int, int], Optional[array.array]]
+    _chunk_lock: threading.RLock
+
+    def __init__(self, width: int, height: int, offset: Tuple[int, int],
+                 read_chunk: Callable[[int, int], Optional[array.array]]):
+        self.width = width
+        self.height = height
         self.x_offset, self.y_offset = offset
+        self.events = {}
+        self.portals = {}
         self.foreground_items = {}
         self.actors = []
-
-    def __getitem__(self, coord: Tuple[int, int]):
-        return self.map[coord[1]][coord[0]]
-
-    def __iter__(self):
-        for row in self.map:
-            yield from row
+        self.placed_actors = {}
+        self.exits = {}
+        self.chunks = {}
+        self.items = {}
+        self.taken_items = set()
+        self.actor_index = SpatialHash()
+        self.sightlines = SightlineIndex()
+        self.player_tiles = set()
+        self.read_chunk = read_chunk
+        self._chunk_lock = threading.RLock()
+
+    def __getitem__(self, coord: Tuple[int, int]) -> TileRef:
+        return TileRef(self, coord[0], coord[1])
+
+    @classmethod
+    def from_map_file(cls, map_file: mapfile.MapFile) -> "AreaMap":
+        data = map_file.data
+        if data.chunk_tiles != CHUNK_TILES:
+            raise ValueError(f"{map_file.path} uses {data.chunk_tiles} tile "
+                             f"chunks, not {CHUNK_TILES}")
+        area_map = cls(data.width, data.height, data.offset,
+                       map_file.read_chunk)
+        area_map.portals = {Portal[name]: position
+                            for name, position in data.portals.items()}
+        area_map.events = {position: event_db[name]
+                           for position, name in data.events.items()}
+        area_map.exits = {position: MapName[name]
+                          for position, name in data.exits.items()}
+        area_map.foreground_items = {position: get_image_from_path(fg_db[image_id])
+                                     for position, image_id in data.foreground.items()}
+        for actor_id, position in data.actors:
+            area_map.place_actor(actor_db[actor_id], position)
+        area_map.populate()
+        return area_map
+
+    def load_chunk(self, chunk_x: int, chunk_y: int) -> Optional[MapChunk]:
+        """Makes a chunk resident, reading it if needed. Returns None for
+        chunks outside the map. Main thread only, like install_chunk."""
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        if chunk is not None:
+            return chunk
+        tile_ids = self.read_chunk(chunk_x, chunk_y)
+        if tile_ids is None:
+            return None
+        return self.install_chunk(chunk_x, chunk_y, tile_ids)
+
+    def install_chunk(self, chunk_x: int, chunk_y: int,
+                      tile_ids: array.array) -> MapChunk:
+        """Makes a chunk that read_chunk returned resident, rebuilding its
+        flags and items and the sightlines that run into it. The actor
+        index and sightlines are only touched on the main thread, so other
+        threads may read chunks but must hand them back to be installed."""
+        with self._chunk_lock:
+            chunk = self.chunks.get((chunk_x, chunk_y))
+            if chunk is not None:
+                return chunk
+            left, top = chunk_x * CHUNK_TILES, chunk_y * CHUNK_TILES
+            flags = bytearray(CHUNK_TILES * CHUNK_TILES)
+            for index, type_id in enumerate(tile_ids):
+                position = (left + index % CHUNK_TILES,
+                            top + index // CHUNK_TILES)
+                if position[0] >= self.width or position[1] >= self.height:
+                    continue
+                tile_type = tile_types[type_id]
+                if tile_type.walkable:
+                    flags[index] |= WALKABLE
+                if tile_type.item and position not in self.taken_items:
+                    self.items[position] = tile_type.item
+                    flags[index] |= ITEM
+            chunk = MapChunk(tile_ids, flags)
+            for actor in self.actor_index.in_rect(left, top, CHUNK_TILES,
+                                                  CHUNK_TILES):
+                flags[self.chunk_index(actor.position)] |= OCCUPIED
+            for position in self.player_tiles:
+                if self.chunk_of(position) == (chunk_x, chunk_y):
+                    flags[self.chunk_index(position)] |= PLAYER_OCCUPIED
+            self.chunks[(chunk_x, chunk_y)] = chunk
+        # Lines that ran into this chunk while it was unloaded were cut short.
+        for actor in self.actors:
+            self.update_sightline(actor)
+        return chunk
+
+    def unload_chunk(self, chunk_x: int, chunk_y: int):
+        with self._chunk_lock:
+            if self.chunks.pop((chunk_x, chunk_y), None) is None:
+                return
+            for position in [position for position in self.items
+                             if self.chunk_of(position) == (chunk_x, chunk_y)]:
+                del self.items[position]
+
+    def unload_all(self):
+        with self._chunk_lock:
+            self.chunks.clear()
+            self.items.clear()
+
+    def chunks_near(self, chunk_x: int, chunk_y: int,
+                    radius: int) -> Iterator[Tuple[int, int]]:
+        """Chunks within radius chunks of chunk_x, chunk_y, nearest first."""
+        for ring in range(radius + 1):
+            for x in range(chunk_x - ring, chunk_x + ring + 1):
+                for y in range(chunk_y - ring, chunk_y + ring + 1):
+                    if max(abs(x - chunk_x), abs(y - chunk_y)) == ring:
+                        yield x, y
+
+    def unload_beyond(self, chunk_x: int, chunk_y: int, radius: int):
+        """Unloads every chunk more than radius chunks from chunk_x, chunk_y."""
+        with self._chunk_lock:
+            for key in list(self.chunks):
+                if max(abs(key[0] - chunk_x), abs(key[1] - chunk_y)) > radius:
+                    self.unload_chunk(*key)
+
+    @staticmethod
+    def chunk_of(position: Tuple[int, int]) -> Tuple[int, int]:
+        return position[0] // CHUNK_TILES, position[1] // CHUNK_TILES
+
+    @staticmethod
+    def chunk_index(position: Tuple[int, int]) -> int:
+        return (position[1] % CHUNK_TILES) * CHUNK_TILES + position[0] % CHUNK_TILES
+
+    def in_bounds(self, position: Tuple[int, int]) -> bool:
+        return 0 <= position[0] < self.width and 0 <= position[1] < self.height
+
+    def resident_chunk(self, position: Tuple[int, int]) -> Optional[MapChunk]:
+        """The loaded chunk holding position, or None if position is outside
+        the map, even when it falls in the padding of an edge chunk."""
+        if not self.in_bounds(position):
+            return None
+        return self.chunks.get(self.chunk_of(position))
+
+    def tile_type(self, position: Tuple[int, int]) -> TileType:
+        chunk = self.resident_chunk(position)
+        if chunk is None:
+            return VOID_TILE
+        return tile_types[chunk.tile_ids[self.chunk_index(position)]]
+
+    def flags(self, position: Tuple[int, int]) -> int:
+        chunk = self.resident_chunk(position)
+        if chunk is None:
+            return 0
+        return chunk.flags[self.chunk_index(position)]
+
+    def set_flag(self, position: Tuple[int, int], flag: int):
+        chunk = self.resident_chunk(position)
+        if chunk is not None:
+            chunk.flags[self.chunk_index(position)] |= flag
+
+    def clear_flag(self, position: Tuple[int, int], flag: int):
+        chunk = self.resident_chunk(position)
+        if chunk is not None:
+            chunk.flags[self.chunk_index(position)] &= ~flag
+
+    def has_flag(self, position: Tuple[int, int], flag: int) -> bool:
+        return bool(self.flags(position) & flag)
+
+    def is_passable(self, position: Tuple[int, int]) -> bool:
+        """Walkable, with no item or actor in the way."""
+        return (self.flags(position) & PASSABLE_MASK) == WALKABLE
+
+    def passable_in_rect(self, left: int, top: int, width: int,
+                         height: int) -> Iterator[Tuple[int, int]]:
+        """Passable resident tiles in a rect given in tiles, clipped to the
+        map. For pathfinding and picking spawn points."""
+        right = min(left + width, self.width)
+        bottom = min(top + height, self.height)
+        for y in range(max(top, 0), bottom):
+            for x in range(max(left, 0), right):
+                if (self.flags((x, y)) & PASSABLE_MASK) == WALKABLE:
+                    yield x, y
+
+    def take_item(self, position: Tuple[int, int]) -> Optional[Item]:
+        with self._chunk_lock:
+            self.clear_flag(position, ITEM)
+            self.taken_items.add(position)
+            return self.items.pop(position, None)
+
+    def occupy_player(self, position: Tuple[int, int]):
+        self.set_flag(position, PLAYER_OCCUPIED)
+        self.player_tiles.add(position)
+
+    def vacate_player(self, keep: Tuple[int, int]):
+        """Clears PLAYER_OCCUPIED everywhere except keep."""
+        for position in self.player_tiles - {keep}:
+            self.clear_flag(position, PLAYER_OCCUPIED)
+        self.player_tiles &= {keep}
+
+    def exits_near(self, x: int, y: int, radius: int) -> Iterator[MapName]:
+        """Destinations of every portal tile within radius tiles of (x, y)."""
+        for (exit_x, exit_y), dest in self.exits.items():
+            if abs(exit_x - x) <= radius and abs(exit_y - y) <= radius:
+                yield dest
+
+    def bake_chunk(self, chunk_x: int, chunk_y: int) -> Image.Image:
+        """Pastes the tiles of one CHUNK_TILES square of the map into an
+        image. Items, actors and foreground are drawn separately. Reads the
+        chunk without making it resident, so any thread may bake."""
+        chunk = self.chunks.get((chunk_x, chunk_y))
+        tile_ids = (chunk.tile_ids if chunk is not None
+                    else self.read_chunk(chunk_x, chunk_y))
+        left, top = chunk_x * CHUNK_TILES, chunk_y * CHUNK_TILES
+        right = min(left + CHUNK_TILES, self.width)
+        bottom = min(top + CHUNK_TILES, self.height)
+        chunk = Image.new("RGBA", ((right - left) * TILE_SIZE,
+                                   (bottom - top) * TILE_SIZE))
+        converted: dict[str, Image.Image] = {}
+        for x in range(left, right):
+            for y in range(top, bottom):
+                if tile_ids is None:
+                    name = VOID_TILE.image_name
+                else:
+                    name = tile_types[tile_ids[self.chunk_index((x, y))]].image_name
+                if name not in converted:
+                    converted[name] = get_image_from_path(name).convert("RGBA")
+                chunk.paste(converted[name],
+                            ((x - left) * TILE_SIZE, (y - top) * TILE_SIZE))
+        return chunk
+
+    def chunk_surface(self, chunk_x: int, chunk_y: int) -> sdl2.SDL_Surface:
+        return GROUND_CHUNKS.get(self, chunk_x, chunk_y)
+
+    def chunks_in_rect(self, left: int, top: int, width: int,
+                       height: int) -> Iterator[Tuple[int, int]]:
+        """Chunks overlapping a rect given in map pixels."""
+        first_x, first_y = max(left // CHUNK_SIZE, 0), max(top // CHUNK_SIZE, 0)
+        last_x = min((left + width - 1) // CHUNK_SIZE,
+                     (self.width - 1) // CHUNK_TILES)
+        last_y = min((top + height - 1) // CHUNK_SIZE,
+                     (self.height - 1) // CHUNK_TILES)
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                yield chunk_x, chunk_y
+
+    def tiles_in_rect(self, left: int, top: int, width: int,
+                      height: int) -> Iterator[Tuple[int, int]]:
+        """Tile coordinates overlapping a rect given in map pixels."""
+        first_x, first_y = max(left // TILE_SIZE, 0), max(top // TILE_SIZE, 0)
+        last_x = min((left + width - 1) // TILE_SIZE, self.width - 1)
+        last_y = min((top + height - 1) // TILE_SIZE, self.height - 1)
+        for x in range(first_x, last_x + 1):
+            for y in range(first_y, last_y + 1):
+                yield x, y
+
+    def place_actor(self, template: Actor, position: Tuple[int, int]) -> Actor:
+        """Adds a copy of an actor_db actor to this map at position. Maps
+        never share Actor objects, so moving one map's actor leaves the
+        others where they are."""
+        actor = copy.copy(template)
+        actor.position = position
+        actor.dest_x, actor.dest_y = position
+        self.actors.append(actor)
+        self.placed_actors[template] = actor
+        return actor
+
+    def placed(self, template: Actor) -> Actor:
+        """This map's copy of an actor_db actor."""
+        return self.placed_actors[template]
 
     def populate(self):
         for actor in self.actors:
-            self.map[actor.position[1]][actor.position[0]].occupied = True
-            self.map[actor.position[1]][actor.position[0]].actor = actor
-
-test_map = AreaMap(
-    [[2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2], 
-     [2, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2],
-     [2, 0, 2, 0, 0, 0, 0, 0, 2, 0, 2],
-     [2, 0, 2, 0, 1, 1, 1, 0, 0, 0, 2],
-     [2, 0, 0, 0, 0, 0, 0, 0, 0, 4, 2], 
-     [2, 2, 2, 2, 2, 2, 2, 2, 2, 2, 2]],
-     
-    (200, 200))
-
-
-def reset_map_coords(map: list[list[Tile]], new_coords: Tuple[int, int]):
-    for i, row in enumerate(map):
-        for j, tile in enumerate(row):
-            tile.grid_x = j - new_coords[0] + 1
-            tile.grid_y = i - new_coords[1] + 1
-            tile.dest_x = j - new_coords[0] + 1
-            tile.dest_y = i - new_coords[1] + 1
+            self.set_flag(actor.position, OCCUPIED)
+            self.actor_index.add(actor, actor.position)
+            self.update_sightline(actor)
+
+    def update_sightline(self, actor: Actor):
+        """Recomputes the tiles an aggressive actor can see. Call whenever
+        the actor moves or turns."""
+        if actor.aggressive:
+            with self._chunk_lock:
+                self.sightlines.update(actor, actor.position, actor.facing,
+                                       actor.sight_range,
+                                       lambda position: self.tile_type(position).walkable)
+
+    def turn_actor(self, actor: Actor, facing: Tuple[int, int]):
+        actor.facing = facing
+        self.update_sightline(actor)
+
+    def watchers_of(self, position: Tuple[int, int]) -> list[Actor]:
+        """Aggressive actors whose line of sight covers position."""
+        with self._chunk_lock:
+            return list(self.sightlines.seen_by(position))
+
 
 def map_change_portal_event(player: "Player", area: AreaMap,
                             scene: "OverworldScene"):
     event_tile = area[player.x, player.y]
+    scene.prefetcher.finish(event_tile.dest_areamap)
     new_map = map_db[event_tile.dest_areamap]
     new_map.x_offset, new_map.y_offset = event_tile.entry_map_offset
     portal_coord = new_map.portals[event_tile.dest_portal]
     offset = event_tile.dest_offset
     player.x = portal_coord[0] + offset[0]
     player.y = portal_coord[1] + offset[1]
-    reset_map_coords(new_map.map, (player.x, player.y))
+    scene.camera.reset(player.x, player.y)
     scene.change_map(new_map)
     scene.event_running = False
 
-test_map.foreground_items = {(2, 1): fg_db[0], (8, 1): fg_db[0]}
-
-test_map.portals = {Portal.DOOR: (9, 4)}
 
-test_map.events = {(9, 4): map_change_portal_event}
-
-cave_map = AreaMap([[2, 2, 2, 2, 2, 2, 2, 2,  2, 2, 2, 2, 2, 2],
-                    [2, 0, 0, 0, 0, 0, 2, 11, 12, 0, 0, 0, 5, 2],
-                    [2, 0, 0, 0, 0, 0, 6, 8,  0, 0, 0, 0, 0, 2],
-                    [2, 0, 0, 0, 0, 0, 9, 10, 0, 0, 0, 0, 0, 2],
-                    [2, 0, 0, 0, 0, 13, 7, 2,  0, 0, 0, 0, 0, 2],
-                    [2, 3, 2, 2, 2, 2, 2, 2,  2, 2, 2, 2, 2, 2],
-                    [2, 2, 2, 2, 2, 2, 2, 2,  2, 2, 2, 2, 2, 2]], (200, 200))
-
-cave_map.actors = [actor_db[0], actor_db[1]]
+event_db = {
+    "map_change_portal": map_change_portal_event
+}
 
-cave_map.populate()
 
-cave_map.portals = {Portal.DOOR: (1, 5)}
+class MapRegistry:
+    """Maps by name, each read from its map file the first time it is
+    asked for."""
+    maps: dict[MapName, AreaMap]
+    _lock: threading.Lock
 
-cave_map.events = {(1, 5): map_change_portal_event}
+    def __init__(self):
+        self.maps = {}
+        self._lock = threading.Lock()
 
-map_db = {MapName.TEST: test_map, MapName.CAVE: cave_map}
+    def __getitem__(self, name: MapName) -> AreaMap:
+        area_map = self.maps.get(name)
+        if area_map is not None:
+            return area_map
+        with self._lock:
+            if name not in self.maps:
+                self.maps[name] = AreaMap.from_map_file(
+                    mapfile.open_map(mapfile.map_path(name.name.lower())))
+            return self.maps[name]
 
+    def __contains__(self, name: MapName) -> bool:
+        return name in self.maps
 
 
+map_db = MapRegistry()
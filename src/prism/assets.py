@@ -0,0 +1,209 @@
+"""Process-wide cache of decoded image resources."""
+import collections
+import importlib.resources
+import logging
+import threading
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Hashable, MutableMapping, Optional
+from PIL import Image
+import sdl2
+
+from prism.bundle import AssetBundle, open_bundle
+
+DEFAULT_ASSET_BUDGET_BYTES = 96 * 1024 * 1024
+
+
+def image_byte_size(image: Image.Image) -> int:
+    width, height = image.size
+    return width * height * len(image.getbands())
+
+
+@dataclass
+class AssetStats:
+    hits: int
+    misses: int
+    reloads: int
+    evictions: int
+    resident_images: int
+    resident_bytes: int
+    pinned_images: int
+    budget_bytes: int
+
+
+class AssetCache:
+    """Shared, already-decoded images keyed by resource name.
+
+    Every caller asking for the same resource gets the same Image object, so
+    callers must treat cached images as read-only. Resources present in the
+    pre-decoded asset bundle are served straight from its memory mapping.
+
+    Resident images are kept under budget_bytes by dropping the least
+    recently used ones that no owner has pinned. An evicted image that is
+    still referenced elsewhere is handed back as-is rather than decoded a
+    second time."""
+    images: collections.OrderedDict
+    budget_bytes: int
+    hits: int
+    misses: int
+    reloads: int
+    evictions: int
+    resident_bytes: int
+    _live: weakref.WeakValueDictionary
+    _evicted: set[str]
+    _pins: MutableMapping[Hashable, set[str]]
+    _pin_counts: collections.Counter
+    _eviction_listeners: list[Callable[[Image.Image], None]]
+    _bundle: Optional[AssetBundle]
+    _bundle_opened: bool
+    _lock: threading.RLock
+
+    def __init__(self, budget_bytes: int = DEFAULT_ASSET_BUDGET_BYTES):
+        self.images = collections.OrderedDict()
+        self.budget_bytes = budget_bytes
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+        self._live = weakref.WeakValueDictionary()
+        self._evicted = set()
+        self._pins = {}
+        self._pin_counts = collections.Counter()
+        self._eviction_listeners = []
+        self._bundle = None
+        self._bundle_opened = False
+        self._lock = threading.RLock()
+
+    @property
+    def bundle(self) -> Optional[AssetBundle]:
+        with self._lock:
+            if not self._bundle_opened:
+                self._bundle = open_bundle()
+                self._bundle_opened = True
+            return self._bundle
+
+    def get_image(self, file_name: str) -> Image.Image:
+        with self._lock:
+            image = self._find(file_name)
+            evicted = self._evict() if image is not None else []
+        if image is not None:
+            self._notify(evicted)
+            return image
+        # Decoded unlocked, so look again before storing it.
+        decoded = self.load_image(file_name)
+        with self._lock:
+            image = self._find(file_name)
+            if image is None:
+                self.misses += 1
+                if file_name in self._evicted:
+                    self.reloads += 1
+                image = decoded
+                self._live[file_name] = image
+                self._admit(file_name, image)
+            evicted = self._evict()
+        self._notify(evicted)
+        return image
+
+    def _find(self, file_name: str) -> Optional[Image.Image]:
+        """Returns a resident or still referenced image, making it resident
+        again if needed. Call with the lock held."""
+        image = self.images.get(file_name)
+        if image is not None:
+            self.hits += 1
+            self.images.move_to_end(file_name)
+            return image
+        image = self._live.get(file_name)
+        if image is not None:
+            self.hits += 1
+            self._admit(file_name, image)
+        return image
+
+    def _admit(self, file_name: str, image: Image.Image):
+        self.images[file_name] = image
+        self.resident_bytes += image_byte_size(image)
+
+    def load_image(self, file_name: str) -> Image.Image:
+        if self.bundle is not None and file_name in self.bundle:
+            return self.bundle.image(file_name)
+        logging.getLogger(__name__).debug("Decoding image: %s", file_name)
+        with importlib.resources.path('prism.resources', file_name) as path:
+            image = Image.open(path)
+            image.load()
+        return image
+
+    def pin(self, owner: Hashable, *file_names: str):
+        """Keeps file_names resident until owner is released. Pinning does not
+        load anything; pinned images are decoded on first use as usual."""
+        with self._lock:
+            pinned = self._pins.setdefault(owner, set())
+            for file_name in file_names:
+                if file_name not in pinned:
+                    pinned.add(file_name)
+                    self._pin_counts[file_name] += 1
+
+    def release(self, owner: Hashable):
+        """Drops every pin held by owner and trims the cache back to budget."""
+        with self._lock:
+            for file_name in self._pins.pop(owner, ()):
+                self._pin_counts[file_name] -= 1
+                if self._pin_counts[file_name] <= 0:
+                    del self._pin_counts[file_name]
+            evicted = self._evict()
+        self._notify(evicted)
+
+    def set_budget(self, budget_bytes: int):
+        with self._lock:
+            self.budget_bytes = budget_bytes
+            evicted = self._evict()
+        self._notify(evicted)
+
+    def add_eviction_listener(self, listener: Callable[[Image.Image], None]):
+        """Registers listener to be called with every image the cache drops,
+        so caches derived from images can drop their copies too."""
+        self._eviction_listeners.append(listener)
+
+    def _evict(self) -> list[Image.Image]:
+        evicted = []
+        if self.resident_bytes <= self.budget_bytes:
+            return evicted
+        for file_name in list(self.images):
+            if self.resident_bytes <= self.budget_bytes:
+                break
+            if file_name in self._pin_counts:
+                continue
+            image = self.images.pop(file_name)
+            self.resident_bytes -= image_byte_size(image)
+            self.evictions += 1
+            self._evicted.add(file_name)
+            evicted.append(image)
+        return evicted
+
+    def _notify(self, evicted: list[Image.Image]):
+        # Listeners run outside the lock; they take locks of their own.
+        for image in evicted:
+            for listener in self._eviction_listeners:
+                listener(image)
+
+    def stats(self) -> AssetStats:
+        with self._lock:
+            return AssetStats(self.hits, self.misses, self.reloads,
+                              self.evictions, len(self.images),
+                              self.resident_bytes, len(self._pin_counts),
+                              self.budget_bytes)
+
+
+CACHE = AssetCache()
+
+
+def get_image_from_path(file_name: str) -> Image.Image:
+    return CACHE.get_image(file_name)
+
+
+def bundled_surface(image: Image.Image) -> Optional[sdl2.SDL_Surface]:
+    """Returns a zero-copy surface for an unmodified image that came from the
+    asset bundle, or None for anything else."""
+    name = image.info.get("bundle_name")
+    if name is None or CACHE.bundle is None:
+        return None
+    return CACHE.bundle.surface(name)
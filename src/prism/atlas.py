@@ -0,0 +1,144 @@
+"""Texture atlases: many small images packed into a few large sheets."""
+import ctypes
+import threading
+from dataclasses import dataclass
+from typing import Callable, Iterable, MutableMapping, Optional
+from PIL import Image
+import sdl2
+
+from prism import ability, ptypes
+from prism.assets import get_image_from_path
+from prism.engine import image_to_surface
+
+ATLAS_SHEET_SIZE = 1024
+
+
+@dataclass
+class AtlasEntry:
+    sheet: int
+    x: int
+    y: int
+    width: int
+    height: int
+
+    @property
+    def rect(self) -> sdl2.SDL_Rect:
+        return sdl2.SDL_Rect(self.x, self.y, self.width, self.height)
+
+
+class Atlas:
+    """Images packed row by row into RGBA sheets, indexed by resource name.
+
+    Each sheet becomes a single SDL surface. Sub-images are handed out as
+    views that share the sheet's pixels, so the atlas must outlive every view
+    it has handed out."""
+    sheets: list[Image.Image]
+    index: MutableMapping[str, AtlasEntry]
+    sheet_size: int
+    _sheet_surfaces: MutableMapping[int, sdl2.SDL_Surface]
+    _views: MutableMapping[str, sdl2.SDL_Surface]
+    _lock: threading.RLock
+
+    def __init__(self, sheet_size: int = ATLAS_SHEET_SIZE):
+        self.sheets = []
+        self.index = {}
+        self.sheet_size = sheet_size
+        self._sheet_surfaces = {}
+        self._views = {}
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __getitem__(self, name: str) -> AtlasEntry:
+        return self.index[name]
+
+    def pack(self, names: Iterable[str]):
+        """Packs the named resources onto shelves, tallest images first."""
+        images = {
+            name: get_image_from_path(name)
+            for name in dict.fromkeys(names) if name not in self.index
+        }
+        order = sorted(images, key=lambda name: images[name].size[1],
+                       reverse=True)
+        sheet: Optional[Image.Image] = None
+        sheet_number = 0
+        x = y = shelf_height = 0
+        for name in order:
+            image = images[name]
+            width, height = image.size
+            if width > self.sheet_size or height > self.sheet_size:
+                self.index[name] = AtlasEntry(len(self.sheets), 0, 0, width,
+                                              height)
+                self.sheets.append(image.convert("RGBA"))
+                continue
+            if sheet is not None and x + width > self.sheet_size:
+                x = 0
+                y += shelf_height
+                shelf_height = 0
+            if sheet is None or y + height > self.sheet_size:
+                sheet = Image.new("RGBA", (self.sheet_size, self.sheet_size))
+                sheet_number = len(self.sheets)
+                self.sheets.append(sheet)
+                x = y = shelf_height = 0
+            sheet.paste(image.convert("RGBA"), (x, y))
+            self.index[name] = AtlasEntry(sheet_number, x, y, width, height)
+            x += width
+            shelf_height = max(shelf_height, height)
+
+    def sheet_surface(self, sheet: int) -> sdl2.SDL_Surface:
+        with self._lock:
+            if sheet not in self._sheet_surfaces:
+                self._sheet_surfaces[sheet] = image_to_surface(
+                    self.sheets[sheet])
+            return self._sheet_surfaces[sheet]
+
+    def surface(self, name: str) -> sdl2.SDL_Surface:
+        """Returns a surface sharing the pixels of name's rect on its sheet."""
+        view = self._views.get(name)
+        if view is not None:
+            return view
+        with self._lock:
+            if name not in self._views:
+                entry = self.index[name]
+                sheet = self.sheet_surface(entry.sheet)
+                pixel_format = sheet.format.contents
+                pixels = (ctypes.cast(sheet.pixels, ctypes.c_void_p).value +
+                          sheet.pitch * entry.y +
+                          pixel_format.BytesPerPixel * entry.x)
+                view = sdl2.SDL_CreateRGBSurfaceFrom(
+                    pixels, entry.width, entry.height,
+                    pixel_format.BitsPerPixel, sheet.pitch, pixel_format.Rmask,
+                    pixel_format.Gmask, pixel_format.Bmask,
+                    pixel_format.Amask).contents
+                view._parent = sheet
+                self._views[name] = view
+            return self._views[name]
+
+
+_atlases: MutableMapping[str, Atlas] = {}
+_atlas_lock = threading.Lock()
+
+
+def shared_atlas(key: str, names: Callable[[], Iterable[str]]) -> Atlas:
+    """The atlas stored under key, packed from names() on first use."""
+    with _atlas_lock:
+        if key not in _atlases:
+            atlas = Atlas()
+            atlas.pack(names())
+            _atlases[key] = atlas
+        return _atlases[key]
+
+
+def ui_names() -> list[str]:
+    names = []
+    for ptype in ptypes.PokemonType:
+        names.append(ability.type_sprite_name(ptype))
+        names.append(ability.plate_name(ptype))
+    names.extend(ability.CLASS_SPRITE_NAMES)
+    return names
+
+
+def ui_atlas() -> Atlas:
+    """Move plates, type icons and damage class icons drawn in battle."""
+    return shared_atlas("ui", ui_names)
@@ -7,37 +7,30 @@ import typing
 from PIL import Image
 import os
 from typing import Tuple
-from prism import engine, text_formatter
-from prism.poke_db import initialize_pokemon
-from prism.abi_db import initialize_abilities
+from prism import engine, fonts, text_formatter
+from prism.atlas import ui_atlas
 from prism.stat import Stat
 from prism.status import BattleEffect, StatusEffect
-from prism.pokemon import pokespawn, Pokemon
+from prism.pokemon import pokespawn, Pokemon, species_sprite_name
 import enum
 import random
 from prism.trainer import Trainer
 from prism.player import Player
+from prism.assets import get_image_from_path
 if typing.TYPE_CHECKING:
     from prism.scene_manager import SceneManager
 
 
-abi_db = initialize_abilities()
-poke_db = initialize_pokemon()
 
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
-
-FONT_FILENAME = "Basic-Regular.ttf"
 NAME_FONT_SIZE = 32
 HEALTH_FONT_SIZE = 24
 MENU_FONT_SIZE = 48
 ABILITY_FONT_SIZE = 32
-
-def init_font(size: int):
-    with importlib.resources.path('prism.resources',
-                                  FONT_FILENAME) as path:
-        return sdl2.sdlttf.TTF_OpenFont(str.encode(os.fspath(path)), size)
+PLAYER_NAMEPLATE = "player_nameplate.png"
+ENEMY_NAMEPLATE = "enemy_nameplate.png"
+BATTLE_ASSETS = [PLAYER_NAMEPLATE, ENEMY_NAMEPLATE, "player_health_bar.png",
+                 "enemy_health_bar.png", "null_filter.png",
+                 "battle_background.png"]
 
 
 
@@ -83,8 +76,6 @@ class BattleScene(engine.Scene):
     battle_options_region: engine.Region
     player_pokemon: "Pokemon"
     enemy_pokemon: "Pokemon"
-    player_nameplate: Image.Image
-    enemy_nameplate: Image.Image
     name_font: sdl2.sdlttf.TTF_Font
     hp_font: sdl2.sdlttf.TTF_Font
     waiting_for_input: bool
@@ -132,18 +123,31 @@ class BattleScene(engine.Scene):
         self.player_pokemon_info_region = self.region.subregion(400, 350, 400, 350)
         self.battle_info_region = self.region.subregion(0, 500, 800, 200)
         self.battle_options_region = self.region.subregion(500, 500, 300, 200)
-        self.player_nameplate = get_image_from_path("player_nameplate.png")
-        self.enemy_nameplate = get_image_from_path("enemy_nameplate.png")
-        self.name_font = init_font(NAME_FONT_SIZE)
-        self.hp_font = init_font(HEALTH_FONT_SIZE)
-        self.menu_font = init_font(MENU_FONT_SIZE)
-        self.ability_font = init_font(ABILITY_FONT_SIZE)
+        self.asset_names.extend(BATTLE_ASSETS)
+        self.name_font = fonts.get_font(NAME_FONT_SIZE).sdl_font
+        self.hp_font = fonts.get_font(HEALTH_FONT_SIZE).sdl_font
+        self.menu_font = fonts.get_font(MENU_FONT_SIZE).sdl_font
+        self.ability_font = fonts.get_font(ABILITY_FONT_SIZE).sdl_font
         
         self.acting_list = []
     
+    @property
+    def player_nameplate(self) -> Image.Image:
+        return get_image_from_path(PLAYER_NAMEPLATE)
+
+    @property
+    def enemy_nameplate(self) -> Image.Image:
+        return get_image_from_path(ENEMY_NAMEPLATE)
+
     def begin_battle(self, player: Player, trainer: "Trainer"):
         self.player = player
         self.trainer = trainer
+        self.scene_manager.asset_cache.pin(
+            self,
+            *(species_sprite_name(pokemon.database_name, "back")
+              for pokemon in player.team),
+            *(species_sprite_name(pokemon.database_name, "front")
+              for pokemon in trainer.team))
 
         for pokemon in self.player.team:
             if pokemon.current_hp > 0 and not pokemon.is_egg:
@@ -196,14 +200,14 @@ class BattleScene(engine.Scene):
     def render_player_pokemon_region(self):
         self.player_pokemon_region.clear()
         if not self.player_pokemon.fainted:
-            pokemon_sprite = self.sprite_factory.from_surface(self.get_scaled_surface(self.player_pokemon.back_image, width=300, height=300))
+            pokemon_sprite = self.sprite_pool.wrap(self.get_scaled_surface(self.player_pokemon.back_image, width=300, height=300))
             height_adjust = self.player_pokemon_region.size()[1] - pokemon_sprite.size[1]
             self.player_pokemon_region.add_sprite(pokemon_sprite, 50, height_adjust)
 
 
     def render_player_pokemon_info_region(self):
         self.player_pokemon_info_region.clear()
-        nameplate = self.sprite_factory.from_surface(self.get_scaled_surface(self.player_nameplate))
+        nameplate = self.sprite_factory.from_surface(engine.clone_surface(self.get_scaled_surface(self.player_nameplate)), free=True)
         
         name_text = sdl2.sdlttf.TTF_RenderText_Blended(self.name_font, str.encode(self.player_pokemon.name), BLACK)
         sdl2.surface.SDL_BlitSurface(name_text, None, nameplate.surface, sdl2.SDL_Rect(60, 13, 0, 0))
@@ -230,7 +234,7 @@ class BattleScene(engine.Scene):
         self.player_pokemon_info_region.add_sprite(nameplate, -30, -5)
 
         if health_bar_width > 0:
-            health_bar = self.sprite_factory.from_surface(self.get_scaled_surface(get_image_from_path("player_health_bar.png"), width = health_bar_width, height = 14))
+            health_bar = self.sprite_pool.wrap(self.get_scaled_surface(get_image_from_path("player_health_bar.png"), width = health_bar_width, height = 14))
             self.player_pokemon_info_region.add_sprite(health_bar, 155, 63)
 
     def render_enemy_regions(self):
@@ -240,12 +244,12 @@ class BattleScene(engine.Scene):
     def render_enemy_pokemon_region(self):
         self.enemy_pokemon_region.clear()
         if not self.enemy_pokemon.fainted:
-            pokemon_sprite = self.sprite_factory.from_surface(self.get_scaled_surface(self.enemy_pokemon.front_image, width = 300, height = 300))
+            pokemon_sprite = self.sprite_pool.wrap(self.get_scaled_surface(self.enemy_pokemon.front_image, width = 300, height = 300))
             self.enemy_pokemon_region.add_sprite(pokemon_sprite, 15, 0)
 
     def render_enemy_pokemon_info_region(self):
         self.enemy_pokemon_info_region.clear()
-        nameplate = self.sprite_factory.from_surface(self.get_scaled_surface(self.enemy_nameplate))
+        nameplate = self.sprite_factory.from_surface(engine.clone_surface(self.get_scaled_surface(self.enemy_nameplate)), free=True)
 
         name_text = sdl2.sdlttf.TTF_RenderText_Blended(self.name_font, str.encode(self.enemy_pokemon.name), BLACK)
         sdl2.surface.SDL_BlitSurface(name_text, None, nameplate.surface, sdl2.SDL_Rect(20, 4, 0, 0))
@@ -268,7 +272,7 @@ class BattleScene(engine.Scene):
         health_bar_width = int(health_percent * 200)
 
         if health_bar_width > 0:
-            health_bar = self.sprite_factory.from_surface(self.get_scaled_surface(get_image_from_path("enemy_health_bar.png"), width = health_bar_width, height = 9))
+            health_bar = self.sprite_pool.wrap(self.get_scaled_surface(get_image_from_path("enemy_health_bar.png"), width = health_bar_width, height = 9))
             self.enemy_pokemon_info_region.add_sprite(health_bar, 155, 101)
 
     def render_battle_regions(self):
@@ -280,8 +284,8 @@ class BattleScene(engine.Scene):
     def render_battle_info_region(self):
         
         self.battle_info_region.clear()
-        outer_box = self.sprite_factory.from_color(AQUA, self.battle_info_region.size())
-        inner_box = self.sprite_factory.from_color(WHITE, (outer_box.size[0] - 18, outer_box.size[1] - 18))
+        outer_box = self.sprite_pool.from_color(AQUA, self.battle_info_region.size())
+        inner_box = self.sprite_pool.from_color(WHITE, (outer_box.size[0] - 18, outer_box.size[1] - 18))
         abilities_to_render = []
         info_to_render = ()
         if not self.selecting_ability or self.selecting_pokemon or self.checking_trainer:
@@ -291,8 +295,6 @@ class BattleScene(engine.Scene):
             elif self.message_queue and not (self.player_ticking_health or self.enemy_ticking_health):
                 max_width = 690
                 self.lines_to_print = text_formatter.get_lines(self.message_queue[0], max_width, MENU_FONT_SIZE)
-            outer_box = self.sprite_factory.from_color(AQUA, self.battle_info_region.size())
-            inner_box = self.sprite_factory.from_color(WHITE, (outer_box.size[0] - 18, outer_box.size[1] - 18))
 
             if self.current_phase == BattlePhase.ACTION_SELECTION:
                 for row, line in enumerate(self.lines_to_print):
@@ -324,7 +326,7 @@ class BattleScene(engine.Scene):
 
         elif self.selecting_ability:
             for i, ability in enumerate(self.player_pokemon.abilities):
-                ability_button = self.sprite_factory.from_surface(self.get_scaled_surface(ability.ability_plate))
+                ability_button = self.sprite_factory.from_surface(engine.clone_surface(ui_atlas().surface(ability.plate_name)), free=True)
                 ability_text = sdl2.sdlttf.TTF_RenderText_Blended(self.ability_font, str.encode(ability.name), BLACK)
                 word_width = text_formatter.get_ability_word_size(ability.name)
                 x_offset = (ability_button.size[0] - word_width) // 2
@@ -333,8 +335,8 @@ class BattleScene(engine.Scene):
                     null_filter = self.get_scaled_surface(get_image_from_path("null_filter.png"))
                     sdl2.surface.SDL_BlitSurface(null_filter, None, ability_button.surface, sdl2.SDL_Rect(0, 0, 0, 0))
                 else:
-                    ability_type_sprite = self.sprite_factory.from_surface(self.get_scaled_surface(ability.ability_type_sprite))
-                    ability_class_sprite = self.sprite_factory.from_surface(self.get_scaled_surface(ability.ability_class_sprite))
+                    ability_type_sprite = self.sprite_from_atlas(ui_atlas(), ability.type_sprite_name)
+                    ability_class_sprite = self.sprite_from_atlas(ui_atlas(), ability.class_sprite_name)
                     pp_text = sdl2.sdlttf.TTF_RenderText_Blended(self.ability_font, str.encode(f"{self.player_pokemon.current_pp[i]}/{ability.max_pp}"), BLACK)
                     pp_width = text_formatter.get_ability_word_size(f"{self.player_pokemon.current_pp[i]}/{ability.max_pp}")
                     sdl2.surface.SDL_BlitSurface(pp_text, None, inner_box.surface, sdl2.SDL_Rect(678 + ((100 - pp_width) // 2), 112, 0, 0))
@@ -357,18 +359,18 @@ class BattleScene(engine.Scene):
 
     def render_battle_options_region(self):
         self.battle_options_region.clear()
-        outer_box = self.sprite_factory.from_color(BLACK, self.battle_options_region.size())
-        inner_box = self.sprite_factory.from_color(WHITE, (outer_box.size[0] - 18, outer_box.size[1] - 18))
+        outer_box = self.sprite_pool.from_color(BLACK, self.battle_options_region.size())
+        inner_box = self.sprite_pool.from_color(WHITE, (outer_box.size[0] - 18, outer_box.size[1] - 18))
         self.battle_options_region.add_sprite(outer_box, 0, 0)
         self.battle_options_region.add_sprite(inner_box, 9, 9)
 
         for i in range(4):
-            outer_action_box = self.sprite_factory.from_color(BLACK, (132, 82))
+            outer_action_box = self.sprite_pool.from_color(BLACK, (132, 82))
             if i == self.selected_action:
                 color = RED
             else:
                 color = WHITE
-            inner_action_box = self.sprite_factory.from_color(color, (126, 76))
+            inner_action_box = self.sprite_pool.from_color(color, (126, 76))
 
             action_text = sdl2.sdlttf.TTF_RenderText_Blended(self.menu_font, str.encode(Action(i).name), BLACK)
             sdl2.surface.SDL_BlitSurface(action_text, None, inner_action_box.surface, sdl2.SDL_Rect(5, 5, 0, 0))
@@ -380,7 +382,7 @@ class BattleScene(engine.Scene):
 
     def full_render(self):
         self.region.clear()
-        background = self.sprite_factory.from_surface(self.get_scaled_surface(get_image_from_path("battle_background.png")))
+        background = self.sprite_pool.wrap(self.get_scaled_surface(get_image_from_path("battle_background.png")))
         self.region.add_sprite(background, 0, 0)
         self.render_enemy_regions()
         self.render_player_regions()
@@ -0,0 +1,179 @@
+"""Pre-decoded asset bundle: every image resource as raw RGBA in one file.
+
+Build it with ``python -m prism.bundle``. At runtime the bundle is memory
+mapped, so images and SDL surfaces point straight into the mapping instead
+of being decoded from PNG. Each entry records the modification time and
+size of the PNG it was built from; when the PNG next to the bundle no
+longer matches, the PNG is decoded instead and a warning asks for a
+rebuild.
+
+Layout (little endian):
+    header   magic (8s), version (I), entry count (I)
+    index    per entry: name length (H), name (utf-8), width (I),
+             height (I), pixel offset (Q), source mtime in ns (q),
+             source size (Q)
+    pixels   RGBA rows, pitch = width * 4, each entry 16-byte aligned
+"""
+import ctypes
+import importlib.resources
+import logging
+import mmap
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import MutableMapping, Optional, Tuple
+from PIL import Image
+import sdl2
+from sdl2 import endian
+
+BUNDLE_MAGIC = b"PRSMBNDL"
+BUNDLE_VERSION = 2
+BUNDLE_FILENAME = "assets.bundle"
+IMAGE_SUFFIXES = (".png",)
+
+HEADER = struct.Struct("<8sII")
+ENTRY_NAME = struct.Struct("<H")
+ENTRY_INFO = struct.Struct("<IIQqQ")
+ALIGNMENT = 16
+
+
+def align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def default_bundle_path() -> Path:
+    return Path(os.fspath(importlib.resources.files('prism.resources'))) / BUNDLE_FILENAME
+
+
+def build_bundle(resource_dir: Path, output: Path) -> int:
+    """Decodes every image in resource_dir into output. Returns the number
+    of images written."""
+    images = []
+    for path in sorted(resource_dir.iterdir()):
+        if path.suffix.lower() in IMAGE_SUFFIXES:
+            with Image.open(path) as image:
+                images.append((path.name, image.convert("RGBA"),
+                               path.stat()))
+
+    index_size = HEADER.size + sum(
+        ENTRY_NAME.size + len(name.encode()) + ENTRY_INFO.size
+        for name, _, _ in images)
+    offset = align(index_size)
+    index = [HEADER.pack(BUNDLE_MAGIC, BUNDLE_VERSION, len(images))]
+    for name, image, source in images:
+        encoded = name.encode()
+        width, height = image.size
+        index.append(ENTRY_NAME.pack(len(encoded)))
+        index.append(encoded)
+        index.append(ENTRY_INFO.pack(width, height, offset, source.st_mtime_ns,
+                                     source.st_size))
+        offset = align(offset + width * height * 4)
+
+    with open(output, "wb") as bundle:
+        bundle.write(b"".join(index))
+        for name, image, _ in images:
+            bundle.write(b"\0" * (align(bundle.tell()) - bundle.tell()))
+            bundle.write(image.tobytes())
+    return len(images)
+
+
+class AssetBundle:
+    """Read-only view of a bundle file through a private memory mapping.
+
+    Names whose source PNG in source_dir has changed since the bundle was
+    built are reported as absent, so callers fall back to the PNG."""
+    path: Path
+    source_dir: Path
+    entries: MutableMapping[str, Tuple[int, int, int]]
+    sources: MutableMapping[str, Tuple[int, int]]
+    _fresh: MutableMapping[str, bool]
+    _map: mmap.mmap
+    _base: ctypes.c_char
+
+    def __init__(self, path: Path, source_dir: Optional[Path] = None):
+        self.path = path
+        self.source_dir = source_dir or path.parent
+        self.sources = {}
+        self._fresh = {}
+        with open(path, "rb") as bundle:
+            # ACCESS_COPY gives a writable private mapping, which ctypes needs
+            # to hand SDL a pointer; nothing ever writes through it.
+            self._map = mmap.mmap(bundle.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, version, count = HEADER.unpack_from(self._map, 0)
+        if magic != BUNDLE_MAGIC or version != BUNDLE_VERSION:
+            raise ValueError(f"{path} is not a version {BUNDLE_VERSION} asset bundle")
+        self.entries = {}
+        cursor = HEADER.size
+        for _ in range(count):
+            (name_length,) = ENTRY_NAME.unpack_from(self._map, cursor)
+            cursor += ENTRY_NAME.size
+            name = self._map[cursor:cursor + name_length].decode()
+            cursor += name_length
+            width, height, offset, mtime, size = ENTRY_INFO.unpack_from(
+                self._map, cursor)
+            self.entries[name] = (width, height, offset)
+            self.sources[name] = (mtime, size)
+            cursor += ENTRY_INFO.size
+        self._base = ctypes.c_char.from_buffer(self._map)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries and self.is_fresh(name)
+
+    def is_fresh(self, name: str) -> bool:
+        """Whether name's source PNG is unchanged since the bundle was built.
+        A missing PNG counts as unchanged, so a bundle can ship alone."""
+        fresh = self._fresh.get(name)
+        if fresh is None:
+            try:
+                source = (self.source_dir / name).stat()
+            except FileNotFoundError:
+                fresh = True
+            else:
+                fresh = (source.st_mtime_ns, source.st_size) == self.sources[name]
+            if not fresh:
+                logging.getLogger(__name__).warning(
+                    "%s has changed since %s was built; decoding the PNG. "
+                    "Rebuild with python -m prism.bundle", name, self.path)
+            self._fresh[name] = fresh
+        return fresh
+
+    def image(self, name: str) -> Image.Image:
+        """Returns a read-only image whose pixels live in the mapping."""
+        width, height, offset = self.entries[name]
+        pixels = memoryview(self._map)[offset:offset + width * height * 4]
+        image = Image.frombuffer("RGBA", (width, height), pixels, "raw",
+                                 "RGBA", 0, 1)
+        image.info["bundle_name"] = name
+        return image
+
+    def surface(self, name: str) -> sdl2.SDL_Surface:
+        """Returns an SDL surface pointing into the mapping, without a copy."""
+        width, height, offset = self.entries[name]
+        if endian.SDL_BYTEORDER == endian.SDL_LIL_ENDIAN:
+            masks = (0x000000FF, 0x0000FF00, 0x00FF0000, 0xFF000000)
+        else:
+            masks = (0xFF000000, 0x00FF0000, 0x0000FF00, 0x000000FF)
+        surface = sdl2.SDL_CreateRGBSurfaceFrom(
+            ctypes.addressof(self._base) + offset, width, height, 32,
+            width * 4, *masks).contents
+        surface._bundle = self
+        return surface
+
+
+def open_bundle(path: Optional[Path] = None) -> Optional[AssetBundle]:
+    path = path or default_bundle_path()
+    if not path.is_file():
+        return None
+    logging.getLogger(__name__).debug("Mapping asset bundle: %s", path)
+    try:
+        return AssetBundle(path)
+    except ValueError as error:
+        logging.getLogger(__name__).warning("Ignoring asset bundle: %s", error)
+        return None
+
+
+if __name__ == "__main__":
+    target = Path(sys.argv[1]) if len(sys.argv) > 1 else default_bundle_path()
+    count = build_bundle(default_bundle_path().parent, target)
+    print(f"Wrote {count} images to {target}")
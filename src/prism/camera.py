@@ -0,0 +1,61 @@
+"""Overworld camera: one world-space offset shared by every tile."""
+from typing import Tuple
+
+from prism.areamap import TILE_SIZE
+
+
+class Camera:
+    """Tracks which map tile the view is anchored on and how far through a
+    step towards dest_x, dest_y it is. Tiles keep their grid coordinates;
+    screen positions are derived from the camera instead."""
+    grid_x: int
+    grid_y: int
+    dest_x: int
+    dest_y: int
+    x_movement_remaining: int
+    y_movement_remaining: int
+
+    def __init__(self, grid_x: int = 1, grid_y: int = 1):
+        self.reset(grid_x, grid_y)
+
+    def reset(self, grid_x: int, grid_y: int):
+        """Anchors the view on grid_x, grid_y with no step in progress."""
+        self.grid_x = grid_x
+        self.grid_y = grid_y
+        self.dest_x = grid_x
+        self.dest_y = grid_y
+        self.x_movement_remaining = TILE_SIZE
+        self.y_movement_remaining = TILE_SIZE
+
+    def begin_step(self, direction: Tuple[int, int]):
+        self.dest_x = self.grid_x + direction[0]
+        self.dest_y = self.grid_y + direction[1]
+
+    def finish_x(self):
+        self.grid_x = self.dest_x
+        self.x_movement_remaining = TILE_SIZE
+
+    def finish_y(self):
+        self.grid_y = self.dest_y
+        self.y_movement_remaining = TILE_SIZE
+
+    @property
+    def x(self) -> int:
+        """Screen x of map column 0, before the map's own offset."""
+        travelled = TILE_SIZE - self.x_movement_remaining
+        if self.dest_x < self.grid_x:
+            travelled = -travelled
+        return (1 - self.grid_x) * TILE_SIZE - travelled
+
+    @property
+    def y(self) -> int:
+        travelled = TILE_SIZE - self.y_movement_remaining
+        if self.dest_y < self.grid_y:
+            travelled = -travelled
+        return (1 - self.grid_y) * TILE_SIZE - travelled
+
+    def screen_x(self, grid_x: int) -> int:
+        return grid_x * TILE_SIZE + self.x
+
+    def screen_y(self, grid_y: int) -> int:
+        return grid_y * TILE_SIZE + self.y
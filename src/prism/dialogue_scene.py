@@ -10,7 +10,7 @@ import typing
 import os
 
 from prism.text_formatter import get_lines, get_word_size
-from prism import engine
+from prism import engine, fonts
 from prism.player import Player
 
 
@@ -24,15 +24,9 @@ WHITE = sdl2.SDL_Color(255, 255, 255)
 
 Y_OFFSET = 36
 
-FONT_FILENAME = "Basic-Regular.ttf"
 FONTSIZE = 30
 
 
-def init_font(size: int):
-    with importlib.resources.path('prism.resources',
-                                  FONT_FILENAME) as path:
-        return sdl2.sdlttf.TTF_OpenFont(str.encode(os.fspath(path)), size)
-
 class DialogueScene(engine.Scene):
 
     printing_dialogue: bool
@@ -61,7 +55,7 @@ class DialogueScene(engine.Scene):
         self.dialogue_speed = 1
         self.lines_printed = 0
         self.characters_printed = 0
-        self.font = init_font(FONTSIZE)
+        self.font = fonts.get_font(FONTSIZE).sdl_font
         self.lines_to_print = []
         self.next_lines = []
         self.prompts = []
@@ -95,8 +89,8 @@ class DialogueScene(engine.Scene):
         prompt_height = 40 + (30 * len(self.prompts))
         prompt_width = widest_prompt + 30
 
-        outer_box = self.sprite_factory.from_color(AQUA, size=(prompt_width, prompt_height))
-        inner_box = self.sprite_factory.from_color(WHITE, size=(prompt_width - 4, prompt_height - 4))
+        outer_box = self.sprite_pool.from_color(AQUA, size=(prompt_width, prompt_height))
+        inner_box = self.sprite_pool.from_color(WHITE, size=(prompt_width - 4, prompt_height - 4))
         for row, prompt in enumerate(self.prompts):
             if row == self.selected_prompt:
                 selected_box = self.sprite_factory.from_color(RED, size=(get_word_size(prompt) + 8, 38))
@@ -113,7 +107,7 @@ class DialogueScene(engine.Scene):
     def full_render(self):
         self.region.clear()
         self.region.add_sprite(self.outer_box, 75, 540)
-        new_inner = self.sprite_factory.from_color(WHITE, (644, 144))
+        new_inner = self.sprite_pool.from_color(WHITE, (644, 144))
         for row, line in enumerate(self.lines_to_print):
             if row < self.lines_printed or self.confirm_for_prompt:
                 text_surface = sdl2.sdlttf.TTF_RenderText_Blended(self.font, str.encode(line), BLACK)
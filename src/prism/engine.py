@@ -1,11 +1,15 @@
 """Core game engine logic."""
+import bisect
+import collections
 import ctypes
 import enum
 import logging
-import operator
 import textwrap
+import threading
+import weakref
 import importlib.resources
-import gc
+import itertools
+from typing import Iterable
 from typing import Iterator
 from typing import Literal
 from typing import MutableMapping
@@ -21,17 +25,23 @@ import sdl2.surface
 from sdl2 import endian
 from pathlib import Path
 import prism.text_formatter
+from prism import assets
+from prism.assets import get_image_from_path, bundled_surface
 import typing
 
 if typing.TYPE_CHECKING:
     from prism.scene_manager import SceneManager
+    from prism.atlas import Atlas
 
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
+RESOURCES = Path(__file__).parent.parent.parent / "resources"
 
+DEFAULT_SURFACE_CACHE_BYTES = 64 * 1024 * 1024
+FULL_REDRAW_FRACTION = 0.5
+MAX_DIRTY_RECTS = 64
+MAX_POOLED_WRAPPERS = 4096
+MAX_POOLED_PER_SIZE = 16
 
-RESOURCES = Path(__file__).parent.parent.parent / "resources"
+_generations = itertools.count(1)
 
 
 def sat_subtract(subtractor: int, subtractee: int) -> int:
@@ -47,12 +57,362 @@ def get_mouse_position() -> Tuple[int, int]:
     return (x.value, y.value)
 
 
+def image_to_surface(img,
+                     width: int = 0,
+                     height: int = 0,
+                     flipped=False) -> sdl2.SDL_Surface:
+    image = img
+    if width != 0 or height != 0:
+        image = image.resize((width, height))
+    else:
+        width, height = (image.size)
+    mode = image.mode
+    if flipped:
+        image = image.transpose(Image.FLIP_LEFT_RIGHT)
+    rmask = gmask = bmask = amask = 0
+    if mode in ("1", "L", "P"):
+        # 1 = B/W, 1 bit per byte
+        # "L" = greyscale, 8-bit
+        # "P" = palette-based, 8-bit
+        pitch = width
+        depth = 8
+    elif mode == "RGB":
+        # 3x8-bit, 24bpp
+
+        if endian.SDL_BYTEORDER == endian.SDL_LIL_ENDIAN:
+            rmask = 0x0000FF
+            gmask = 0x00FF00
+            bmask = 0xFF0000
+        else:
+            rmask = 0xFF0000
+            gmask = 0x00FF00
+            bmask = 0x0000FF
+        depth = 24
+        pitch = width * 3
+    elif mode in ("RGBA", "RGBX"):
+        # RGBX: 4x8-bit, no alpha
+        # RGBA: 4x8-bit, alpha
+
+        if endian.SDL_BYTEORDER == endian.SDL_LIL_ENDIAN:
+            rmask = 0x000000FF
+            gmask = 0x0000FF00
+            bmask = 0x00FF0000
+            if mode == "RGBA":
+                amask = 0xFF000000
+        else:
+            rmask = 0xFF000000
+            gmask = 0x00FF0000
+            bmask = 0x0000FF00
+            if mode == "RGBA":
+                amask = 0x000000FF
+        depth = 32
+        pitch = width * 4
+    else:
+        # We do not support CMYK or YCbCr for now
+        raise TypeError("unsupported image format")
+    pxbuf = image.tobytes()
+    imgsurface = sdl2.ext.surface.SDL_CreateRGBSurfaceFrom(
+        pxbuf, width, height, depth, pitch, rmask, gmask, bmask, amask)
+    imgsurface = imgsurface.contents
+    imgsurface._pxbuf = pxbuf
+    return imgsurface
+
+
+def free_when_unreferenced(surface: sdl2.SDL_Surface) -> sdl2.SDL_Surface:
+    """Calls SDL_FreeSurface on surface once nothing in Python refers to it
+    any more. Cached surfaces are shared with sprites that can outlive the
+    cache entry, so the cache cannot free them itself when it evicts."""
+    pointer = ctypes.cast(ctypes.addressof(surface),
+                          ctypes.POINTER(sdl2.SDL_Surface))
+    finalizer = weakref.finalize(surface, sdl2.SDL_FreeSurface, pointer)
+    # SDL may already be shut down at interpreter exit.
+    finalizer.atexit = False
+    return surface
+
+
+class SurfaceCache:
+    """Size-bounded LRU of SDL surfaces converted from PIL images.
+
+    Entries are keyed by (image identity, width, height, flipped) and keep a
+    reference to their source image so its identity cannot be reused while the
+    entry is alive. A surface is freed once it has been evicted and no sprite
+    still uses it."""
+    max_bytes: int
+    resident_bytes: int
+    hits: int
+    misses: int
+    _entries: collections.OrderedDict
+    _lock: threading.RLock
+
+    def __init__(self, max_bytes: int = DEFAULT_SURFACE_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.resident_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.RLock()
+
+    def get_surface(self,
+                    img,
+                    width: int = 0,
+                    height: int = 0,
+                    flipped=False) -> sdl2.SDL_Surface:
+        key = (id(img), width, height, flipped)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+        surface = None
+        if width == 0 and height == 0 and not flipped:
+            surface = bundled_surface(img)
+        if surface is None:
+            surface = image_to_surface(img, width, height, flipped)
+        free_when_unreferenced(surface)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return entry[1]
+            self.misses += 1
+            self._entries[key] = (img, surface)
+            self.resident_bytes += surface.pitch * surface.h
+            self.evict()
+            return surface
+
+    def evict(self):
+        with self._lock:
+            while self.resident_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, surface) = self._entries.popitem(last=False)
+                self.resident_bytes -= surface.pitch * surface.h
+
+    def discard_image(self, img):
+        """Drops every surface converted from img."""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == id(img)]:
+                _, surface = self._entries.pop(key)
+                self.resident_bytes -= surface.pitch * surface.h
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.resident_bytes = 0
+
+
+SURFACE_CACHE = SurfaceCache()
+assets.CACHE.add_eviction_listener(SURFACE_CACHE.discard_image)
+
+
+def rects_overlap(a: Tuple[int, int, int, int],
+                  b: Tuple[int, int, int, int]) -> bool:
+    return (a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and
+            a[1] < b[1] + b[3] and b[1] < a[1] + a[3])
+
+
+def merge_rects(
+        rects: Iterable[Tuple[int, int, int, int]]
+) -> list[Tuple[int, int, int, int]]:
+    """Unions overlapping rects until none overlap, so no pixel is redrawn
+    twice in one frame."""
+    merged: list[Tuple[int, int, int, int]] = []
+    for rect in rects:
+        while True:
+            for other in merged:
+                if rects_overlap(rect, other):
+                    merged.remove(other)
+                    left = min(rect[0], other[0])
+                    top = min(rect[1], other[1])
+                    right = max(rect[0] + rect[2], other[0] + other[2])
+                    bottom = max(rect[1] + rect[3], other[1] + other[3])
+                    rect = (left, top, right - left, bottom - top)
+                    break
+            else:
+                break
+        merged.append(rect)
+    return merged
+
+
+class DirtyRectRenderer:
+    """Presents sprites to a window, redrawing only what changed.
+
+    Each frame's sprites are compared with the previous frame's by surface,
+    position, size and generation. Wherever a sprite appeared or went away,
+    every sprite overlapping that rectangle is blitted again in draw order,
+    and only those rectangles are pushed to the window. A sprite whose pixels
+    are changed in place must have its generation attribute bumped. The
+    previous frame's sprites are held so their surfaces cannot be freed and
+    reused while they are still being compared against."""
+    window: sdl2.ext.Window
+    full_redraws: int
+    partial_redraws: int
+    idle_frames: int
+    _previous: collections.Counter
+    _previous_sprites: list[sdl2.ext.Sprite]
+    _size: Tuple[int, int]
+    _force_full: bool
+
+    def __init__(self, window: sdl2.ext.Window):
+        self.window = window
+        self.full_redraws = 0
+        self.partial_redraws = 0
+        self.idle_frames = 0
+        self._previous = collections.Counter()
+        self._previous_sprites = []
+        self._size = (0, 0)
+        self._force_full = True
+
+    def invalidate(self):
+        """Makes the next frame redraw and present the whole window."""
+        self._force_full = True
+
+    def dirty_rects(
+            self, current: collections.Counter,
+            size: Tuple[int, int]) -> Optional[list[Tuple[int, int, int, int]]]:
+        """Returns the merged rects to redraw, or None for a full redraw."""
+        if self._force_full or size != self._size:
+            return None
+        width, height = size
+        clipped = []
+        for key in (self._previous - current) + (current - self._previous):
+            _, x, y, w, h, _ = key
+            left, top = max(x, 0), max(y, 0)
+            right, bottom = min(x + w, width), min(y + h, height)
+            if right > left and bottom > top:
+                clipped.append((left, top, right - left, bottom - top))
+        rects = merge_rects(clipped)
+        area = sum(rect[2] * rect[3] for rect in rects)
+        if len(rects) > MAX_DIRTY_RECTS or area > width * height * FULL_REDRAW_FRACTION:
+            return None
+        return rects
+
+    def render(self, sprites: Iterable[sdl2.ext.Sprite]):
+        target = sdl2.SDL_GetWindowSurface(self.window.window).contents
+        drawn = list(sprites)
+        current = collections.Counter(
+            (ctypes.addressof(sprite.surface), sprite.x, sprite.y,
+             sprite.surface.w, sprite.surface.h,
+             getattr(sprite, "generation", 0)) for sprite in drawn)
+        size = (target.w, target.h)
+        rects = self.dirty_rects(current, size)
+
+        if rects is None:
+            for sprite in drawn:
+                sdl2.surface.SDL_BlitSurface(
+                    sprite.surface, None, target,
+                    sdl2.SDL_Rect(sprite.x, sprite.y, 0, 0))
+            sdl2.SDL_UpdateWindowSurface(self.window.window)
+            self.full_redraws += 1
+        elif rects:
+            sdl_rects = (sdl2.SDL_Rect * len(rects))(
+                *(sdl2.SDL_Rect(*rect) for rect in rects))
+            for rect in sdl_rects:
+                sdl2.surface.SDL_SetClipRect(target, rect)
+                bounds = (rect.x, rect.y, rect.w, rect.h)
+                for sprite in drawn:
+                    if rects_overlap(bounds, (sprite.x, sprite.y,
+                                              sprite.surface.w,
+                                              sprite.surface.h)):
+                        sdl2.surface.SDL_BlitSurface(
+                            sprite.surface, None, target,
+                            sdl2.SDL_Rect(sprite.x, sprite.y, 0, 0))
+            sdl2.surface.SDL_SetClipRect(target, None)
+            sdl2.SDL_UpdateWindowSurfaceRects(self.window.window, sdl_rects,
+                                              len(rects))
+            self.partial_redraws += 1
+        else:
+            self.idle_frames += 1
+
+        self._previous = current
+        self._previous_sprites = drawn
+        self._size = size
+        self._force_full = False
+
+
+class SpritePool:
+    """Recycles sprites between frames instead of leaving them to the garbage
+    collector.
+
+    wrap() hands out wrappers around surfaces owned elsewhere, such as cached
+    or atlas surfaces. from_color() hands out solid-colour sprites that own
+    their surface; a recycled one is refilled and gets a new generation, so
+    the renderer sees its pixels changed. Region.clear() and clear_sprites()
+    give pooled sprites back, so callers must not keep a pooled sprite past
+    the region it was added to."""
+    factory: sdl2.ext.SpriteFactory
+    created: int
+    reused: int
+    _wrappers: list[sdl2.ext.SoftwareSprite]
+    _colored: MutableMapping[Tuple[int, int], list[sdl2.ext.SoftwareSprite]]
+
+    def __init__(self, factory: sdl2.ext.SpriteFactory):
+        self.factory = factory
+        self.created = 0
+        self.reused = 0
+        self._wrappers = []
+        self._colored = {}
+
+    def wrap(self, surface: sdl2.SDL_Surface) -> sdl2.ext.SoftwareSprite:
+        if self._wrappers:
+            sprite = self._wrappers.pop()
+            sprite.surface = surface
+            self.reused += 1
+        else:
+            sprite = self.factory.from_surface(surface, free=False)
+            sprite.pool = self
+            self.created += 1
+        sprite.generation = 0
+        sprite.pooled = False
+        return sprite
+
+    def from_color(self, color,
+                   size: Tuple[int, int]) -> sdl2.ext.SoftwareSprite:
+        bucket = self._colored.get(tuple(size))
+        if bucket:
+            sprite = bucket.pop()
+            sdl2.ext.fill(sprite.surface, color)
+            self.reused += 1
+        else:
+            sprite = self.factory.from_color(color, size)
+            sprite.pool = self
+            self.created += 1
+        sprite.generation = next(_generations)
+        sprite.pooled = False
+        return sprite
+
+    def release(self, sprite: sdl2.ext.SoftwareSprite):
+        if sprite.pooled:
+            return
+        if sprite.free:
+            bucket = self._colored.setdefault(sprite.size, [])
+            if len(bucket) >= MAX_POOLED_PER_SIZE:
+                return
+        else:
+            bucket = self._wrappers
+            if len(bucket) >= MAX_POOLED_WRAPPERS:
+                return
+            # An idle wrapper must not keep an evicted surface alive.
+            sprite.surface = None
+        sprite.pooled = True
+        bucket.append(sprite)
+
+
+def release_sprites(sprites: Iterable[sdl2.ext.Sprite]):
+    for sprite in sprites:
+        pool = getattr(sprite, "pool", None)
+        if pool is not None:
+            pool.release(sprite)
+
+
 class Scene:
     """Scene assets, draw regions, and associated game state."""
     surfaces: MutableMapping[str, sdl2.SDL_Surface]
+    asset_names: list[str]
     region: "Region"
     sprite_factory: sdl2.ext.SpriteFactory
     ui_factory: sdl2.ext.UIFactory
+    sprite_pool: SpritePool
     resource_manager: sdl2.ext.Resources
     triggered_event: bool
     font: None
@@ -67,7 +427,9 @@ class Scene:
         self.region = Region()
         self.sprite_factory = sdl2.ext.SpriteFactory(sprite_type, free=False)
         self.ui_factory = sdl2.ext.UIFactory(self.sprite_factory, free=False)
+        self.sprite_pool = SpritePool(self.sprite_factory)
         self.surfaces = dict()
+        self.asset_names = []
         self.window_closing = False
         self.window_up = False
         self.triggered_event = False
@@ -77,6 +439,7 @@ class Scene:
         for (k, v) in kwargs.items():
             log.debug("Loading image: %s", v)
             self.surfaces[k] = get_image_from_path(v)
+            self.asset_names.append(v)
 
     def renderables(self) -> Iterator[sdl2.ext.Sprite]:
         return iter(self.region)
@@ -97,61 +460,14 @@ class Scene:
                            width: int = 0,
                            height: int = 0,
                            flipped=False) -> sdl2.SDL_Surface:
-        image = img
-        if width != 0 or height != 0:
-            image = image.resize((width, height))
-        else:
-            width, height = (image.size)
-        mode = image.mode
-        if flipped:
-            image = image.transpose(Image.FLIP_LEFT_RIGHT)
-        rmask = gmask = bmask = amask = 0
-        if mode in ("1", "L", "P"):
-            # 1 = B/W, 1 bit per byte
-            # "L" = greyscale, 8-bit
-            # "P" = palette-based, 8-bit
-            pitch = width
-            depth = 8
-        elif mode == "RGB":
-            # 3x8-bit, 24bpp
-
-            if endian.SDL_BYTEORDER == endian.SDL_LIL_ENDIAN:
-                rmask = 0x0000FF
-                gmask = 0x00FF00
-                bmask = 0xFF0000
-            else:
-                rmask = 0xFF0000
-                gmask = 0x00FF00
-                bmask = 0x0000FF
-            depth = 24
-            pitch = width * 3
-        elif mode in ("RGBA", "RGBX"):
-            # RGBX: 4x8-bit, no alpha
-            # RGBA: 4x8-bit, alpha
-
-            if endian.SDL_BYTEORDER == endian.SDL_LIL_ENDIAN:
-                rmask = 0x000000FF
-                gmask = 0x0000FF00
-                bmask = 0x00FF0000
-                if mode == "RGBA":
-                    amask = 0xFF000000
-            else:
-                rmask = 0xFF000000
-                gmask = 0x00FF0000
-                bmask = 0x0000FF00
-                if mode == "RGBA":
-                    amask = 0x000000FF
-            depth = 32
-            pitch = width * 4
-        else:
-            # We do not support CMYK or YCbCr for now
-            raise TypeError("unsupported image format")
-        pxbuf = image.tobytes()
-        imgsurface = sdl2.ext.surface.SDL_CreateRGBSurfaceFrom(
-            pxbuf, width, height, depth, pitch, rmask, gmask, bmask, amask)
-        imgsurface = imgsurface.contents
-        imgsurface._pxbuf = pxbuf
-        return imgsurface
+        """Returns a shared surface for img; callers must not draw onto it or
+        free it. Use clone_surface first when the result will be modified."""
+        return SURFACE_CACHE.get_surface(img, width, height, flipped)
+
+    def sprite_from_atlas(self, atlas: "Atlas",
+                          name: str) -> sdl2.ext.SoftwareSprite:
+        """Wraps name's rect on its atlas sheet without copying pixels."""
+        return self.sprite_pool.wrap(atlas.surface(name))
 
     def create_selected_version(
             self, surface: sdl2.SDL_Surface,
@@ -184,8 +500,8 @@ class Scene:
                             y: int,
                             depth: int = 0):
         width, height = sprite.size
-        border_sprite = self.sprite_factory.from_color(color,
-                                                       (width + 4, height + 4))
+        border_sprite = self.sprite_pool.from_color(color,
+                                                     (width + 4, height + 4))
         region.add_sprite(border_sprite, x - 2, y - 2, depth=depth)
         region.add_sprite(sprite, x, y, depth)
 
@@ -253,14 +569,52 @@ class Scene:
         return new_sprite
 
 
+class DepthBuckets:
+    """Sprites grouped by depth. Iterates in ascending depth, and in insertion
+    order within a depth, matching a stable sort on depth."""
+    _depths: list[int]
+    _buckets: MutableMapping[int, list[sdl2.ext.Sprite]]
+
+    def __init__(self):
+        self._depths = []
+        self._buckets = {}
+
+    def __iter__(self) -> Iterator[sdl2.ext.Sprite]:
+        for depth in self._depths:
+            yield from self._buckets[depth]
+
+    def __reversed__(self) -> Iterator[sdl2.ext.Sprite]:
+        for depth in reversed(self._depths):
+            yield from reversed(self._buckets[depth])
+
+    def __len__(self) -> int:
+        return sum(len(bucket) for bucket in self._buckets.values())
+
+    def add(self, sprite: sdl2.ext.Sprite, depth: int):
+        bucket = self._buckets.get(depth)
+        if bucket is None:
+            bucket = self._buckets[depth] = []
+            bisect.insort(self._depths, depth)
+        bucket.append(sprite)
+
+    def clear(self):
+        self._depths.clear()
+        self._buckets.clear()
+
+
 class Region:
-    """Spatial region on the screen with relative coordinate offsets & spinning rims."""
+    """Spatial region on the screen with relative coordinate offsets & spinning rims.
+
+    Sprites are retained between frames. A region starts out dirty; scenes
+    that render every frame rebuild only the regions that were invalidated
+    since they last called mark_clean."""
     x: int
     y: int
     width: int
     height: int
     _regions: list["Region"]
-    _sprites: list[sdl2.ext.Sprite]
+    _sprites: DepthBuckets
+    _dirty: bool
 
     def __init__(self,
                  x: int = 0,
@@ -272,7 +626,8 @@ class Region:
         self.width = width
         self.height = height
         self._regions = []
-        self._sprites = []
+        self._sprites = DepthBuckets()
+        self._dirty = True
 
     def __iter__(self) -> Iterator[sdl2.ext.Sprite]:
         yield from self._sprites
@@ -292,8 +647,7 @@ class Region:
         sprite.x = self.x + x
         sprite.y = self.y + y
         sprite.depth = depth
-        self._sprites.append(sprite)
-        self._sprites.sort(key=operator.attrgetter('depth'))
+        self._sprites.add(sprite, depth)
 
     def add_sprite_vertical_center(self,
                                    sprite: sdl2.ext.Sprite,
@@ -307,20 +661,35 @@ class Region:
 
         sprite.y = self.y + region_center - sprite_center
 
-        self._sprites.append(sprite)
-        self._sprites.sort(key=operator.attrgetter('depth'))
+        self._sprites.add(sprite, depth)
 
     def size(self) -> Tuple[int, int]:
         return (self.width, self.height)
 
+    @property
+    def dirty(self) -> bool:
+        return self._dirty
+
+    def invalidate(self):
+        """Marks this region to be rebuilt on the next render."""
+        self._dirty = True
+
+    def mark_clean(self):
+        self._dirty = False
+
+    def clear_sprites(self):
+        """Removes this region's own sprites, leaving sub-regions intact.
+        Pooled sprites go back to their pool."""
+        release_sprites(self._sprites)
+        self._sprites.clear()
+        self._dirty = True
+
     def clear(self):
         """Removes all sprites from this region and all sub-regions"""
-        self._sprites.clear()
+        self.clear_sprites()
 
         for subregion in self._regions:
             subregion.clear()
-        
-        gc.collect()
 
     def from_bottom(self, y: int) -> int:
         return self.height - y
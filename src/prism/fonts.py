@@ -0,0 +1,87 @@
+"""Process-wide registry of fonts, shared by SDL_ttf and PIL."""
+import importlib.resources
+import logging
+import os
+import threading
+from typing import MutableMapping, Optional, Tuple
+from PIL import ImageFont
+import sdl2.sdlttf
+
+DEFAULT_FACE = "Basic-Regular.ttf"
+
+
+class Font:
+    """One face at one size. The SDL_ttf handle renders text and the PIL
+    handle measures it; each is opened the first time it is needed."""
+    face: str
+    size: int
+    _sdl_font: Optional[sdl2.sdlttf.TTF_Font]
+    _measure: Optional[ImageFont.FreeTypeFont]
+
+    def __init__(self, face: str, size: int):
+        self.face = face
+        self.size = size
+        self._sdl_font = None
+        self._measure = None
+
+    @property
+    def sdl_font(self) -> sdl2.sdlttf.TTF_Font:
+        if self._sdl_font is None:
+            logging.getLogger(__name__).debug("Opening font: %s %d",
+                                              self.face, self.size)
+            with importlib.resources.path('prism.resources', self.face) as path:
+                self._sdl_font = sdl2.sdlttf.TTF_OpenFont(
+                    str.encode(os.fspath(path)), self.size)
+        return self._sdl_font
+
+    @property
+    def measure(self) -> ImageFont.FreeTypeFont:
+        if self._measure is None:
+            with importlib.resources.path('prism.resources', self.face) as path:
+                self._measure = ImageFont.truetype(os.fspath(path),
+                                                   size=self.size)
+        return self._measure
+
+    def width(self, text: str) -> int:
+        return self.measure.getsize(text)[0]
+
+    def close(self):
+        if self._sdl_font is not None:
+            sdl2.sdlttf.TTF_CloseFont(self._sdl_font)
+            self._sdl_font = None
+        self._measure = None
+
+
+class FontRegistry:
+    """Fonts keyed by (face, size), kept open until close_all."""
+    fonts: MutableMapping[Tuple[str, int], Font]
+    _lock: threading.Lock
+
+    def __init__(self):
+        self.fonts = {}
+        self._lock = threading.Lock()
+
+    def get_font(self, size: int, face: str = DEFAULT_FACE) -> Font:
+        with self._lock:
+            font = self.fonts.get((face, size))
+            if font is None:
+                font = Font(face, size)
+                self.fonts[(face, size)] = font
+            return font
+
+    def close_all(self):
+        with self._lock:
+            for font in self.fonts.values():
+                font.close()
+            self.fonts.clear()
+
+
+FONTS = FontRegistry()
+
+
+def get_font(size: int, face: str = DEFAULT_FACE) -> Font:
+    return FONTS.get_font(size, face)
+
+
+def close_all():
+    FONTS.close_all()
@@ -7,8 +7,7 @@ from . import pokemon
 from .ability import Ability, AbilityType, TargetingType
 from . import ptypes
 from . import decisions
-from . import abi_db
-from . import poke_db
+from . import registry
 from .passive import Passive
 from .stat import Stat
 
@@ -111,8 +110,8 @@ def execute_turn(team1: list[pokemon.Pokemon], team2: list[pokemon.Pokemon], bat
 
 def main():
 
-    abilities = abi_db.initialize_abilities()
-    pokemon = poke_db.initialize_pokemon()
+    abilities = registry.abilities()
+    pokemon = registry.species()
 
     slowbro = pokemon["slowbro"]
     garchomp = pokemon["garchomp"]
@@ -0,0 +1,248 @@
+"""Versioned on-disk format for overworld maps.
+
+Map files live next to the other resources as ``<map name>.map``. The tile
+grid is stored chunk by chunk, so a map of any size can be opened by
+reading its header and metadata alone; chunks are then read from a memory
+mapping as the player approaches them.
+
+Layout (little endian):
+    header    magic (8s), version (I), width (I), height (I),
+              x offset (i), y offset (i), chunk tiles (I), metadata length (I)
+    metadata  utf-8 JSON: portals by Portal name, events by registered
+              event name, exits by MapName name, foreground image ids and
+              actor placements
+    chunks    padded to 16 bytes, then one block of chunk tiles squared tile
+              ids (H) per chunk, row by row within the chunk. Chunks are
+              ordered row by row; edge chunks are padded with tile id 0.
+
+Map files are built from editable JSON sources, ``<map name>.map.json``,
+which hold the same metadata plus the grid as rows of space separated tile
+ids. Sources have no exits; they are derived from the tiles whose tile_db
+entry has a dest_areamap. ``python -m prism.mapfile`` rebuilds every map that has a source;
+``python -m prism.mapfile --dump <map name>`` writes a source for an
+existing map file.
+"""
+import array
+import importlib.resources
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Mapping, MutableMapping, Optional, Tuple
+
+MAP_MAGIC = b"PRSMMAP\0"
+MAP_VERSION = 2
+MAP_SUFFIX = ".map"
+SOURCE_SUFFIX = ".map.json"
+DEFAULT_CHUNK_TILES = 16
+
+HEADER = struct.Struct("<8sIIIiiII")
+ALIGNMENT = 16
+
+
+def align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+@dataclass
+class MapData:
+    """Everything a map file holds. tile_ids is the whole grid row by row;
+    it is only filled in when writing a map or reading one in full."""
+    width: int
+    height: int
+    offset: Tuple[int, int]
+    tile_ids: array.array = field(default_factory=lambda: array.array("H"))
+    portals: MutableMapping[str, Tuple[int, int]] = field(default_factory=dict)
+    events: MutableMapping[Tuple[int, int], str] = field(default_factory=dict)
+    exits: MutableMapping[Tuple[int, int], str] = field(default_factory=dict)
+    foreground: MutableMapping[Tuple[int, int], int] = field(default_factory=dict)
+    actors: list[Tuple[int, Tuple[int, int]]] = field(default_factory=list)
+    chunk_tiles: int = DEFAULT_CHUNK_TILES
+
+
+def maps_directory() -> Path:
+    return Path(os.fspath(importlib.resources.files('prism.resources')))
+
+
+def map_path(name: str) -> Path:
+    return maps_directory() / (name + MAP_SUFFIX)
+
+
+def chunk_counts(width: int, height: int, chunk_tiles: int) -> Tuple[int, int]:
+    return -(-width // chunk_tiles), -(-height // chunk_tiles)
+
+
+def source_path(name: str) -> Path:
+    return map_path(name).with_suffix(SOURCE_SUFFIX)
+
+
+def metadata_of(data: MapData) -> dict:
+    return {
+        "portals": {name: list(position) for name, position in data.portals.items()},
+        "events": [[x, y, name] for (x, y), name in data.events.items()],
+        "exits": [[x, y, name] for (x, y), name in data.exits.items()],
+        "foreground": [[x, y, image_id] for (x, y), image_id in data.foreground.items()],
+        "actors": [[actor_id, x, y] for actor_id, (x, y) in data.actors],
+    }
+
+
+def map_data(width: int, height: int, offset: Tuple[int, int], metadata: dict,
+             chunk_tiles: int = DEFAULT_CHUNK_TILES,
+             tile_ids: Optional[array.array] = None) -> MapData:
+    return MapData(
+        width, height, offset,
+        tile_ids if tile_ids is not None else array.array("H"),
+        portals={name: tuple(position)
+                 for name, position in metadata["portals"].items()},
+        events={(x, y): name for x, y, name in metadata["events"]},
+        exits={(x, y): name for x, y, name in metadata["exits"]},
+        foreground={(x, y): image_id
+                    for x, y, image_id in metadata["foreground"]},
+        actors=[(actor_id, (x, y)) for actor_id, x, y in metadata["actors"]],
+        chunk_tiles=chunk_tiles)
+
+
+def encode_map(data: MapData) -> bytes:
+    metadata = json.dumps(metadata_of(data), separators=(",", ":")).encode()
+    size = data.chunk_tiles
+    chunks_x, chunks_y = chunk_counts(data.width, data.height, size)
+    grid = array.array("H")
+    for chunk_y in range(chunks_y):
+        for chunk_x in range(chunks_x):
+            for y in range(chunk_y * size, (chunk_y + 1) * size):
+                for x in range(chunk_x * size, (chunk_x + 1) * size):
+                    inside = x < data.width and y < data.height
+                    grid.append(data.tile_ids[y * data.width + x] if inside else 0)
+    if sys.byteorder != "little":
+        grid.byteswap()
+    header = HEADER.pack(MAP_MAGIC, MAP_VERSION, data.width, data.height,
+                         data.offset[0], data.offset[1], size, len(metadata))
+    padding = align(len(header) + len(metadata)) - len(header) - len(metadata)
+    return b"".join((header, metadata, b"\0" * padding, grid.tobytes()))
+
+
+class MapFile:
+    """An open map file. Metadata is parsed up front; chunks are read from
+    a read-only memory mapping on request. Safe to read from any thread."""
+    path: Path
+    data: MapData
+    chunks_x: int
+    chunks_y: int
+    _grid_start: int
+    _map: mmap.mmap
+
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as map_file:
+            self._map = mmap.mmap(map_file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            (magic, version, width, height, x_offset, y_offset, chunk_tiles,
+             metadata_length) = HEADER.unpack_from(self._map, 0)
+        except struct.error as error:
+            raise ValueError(f"{path}: {error}") from error
+        if magic != MAP_MAGIC or version != MAP_VERSION:
+            raise ValueError(f"{path} is not a version {MAP_VERSION} map file")
+        metadata = json.loads(
+            self._map[HEADER.size:HEADER.size + metadata_length])
+        self.data = map_data(width, height, (x_offset, y_offset), metadata,
+                             chunk_tiles)
+        self.chunks_x, self.chunks_y = chunk_counts(width, height, chunk_tiles)
+        self._grid_start = align(HEADER.size + metadata_length)
+
+    def read_chunk(self, chunk_x: int, chunk_y: int) -> Optional[array.array]:
+        """Tile ids of one chunk, or None for a chunk outside the map."""
+        if not (0 <= chunk_x < self.chunks_x and 0 <= chunk_y < self.chunks_y):
+            return None
+        chunk_bytes = self.data.chunk_tiles * self.data.chunk_tiles * 2
+        start = (self._grid_start +
+                 (chunk_y * self.chunks_x + chunk_x) * chunk_bytes)
+        tile_ids = array.array("H")
+        tile_ids.frombytes(self._map[start:start + chunk_bytes])
+        if sys.byteorder != "little":
+            tile_ids.byteswap()
+        return tile_ids
+
+    def read_all(self) -> MapData:
+        """The full map, grid included, for tools that edit maps."""
+        data = self.data
+        size = data.chunk_tiles
+        tile_ids = array.array("H", bytes(2 * data.width * data.height))
+        for chunk_y in range(self.chunks_y):
+            for chunk_x in range(self.chunks_x):
+                chunk = self.read_chunk(chunk_x, chunk_y)
+                for y in range(chunk_y * size, min((chunk_y + 1) * size, data.height)):
+                    for x in range(chunk_x * size, min((chunk_x + 1) * size, data.width)):
+                        tile_ids[y * data.width + x] = chunk[
+                            (y - chunk_y * size) * size + x - chunk_x * size]
+        return MapData(data.width, data.height, data.offset, tile_ids,
+                       dict(data.portals), dict(data.events), dict(data.exits),
+                       dict(data.foreground), list(data.actors), size)
+
+
+def write_map(path: Path, data: MapData):
+    with open(path, "wb") as map_file:
+        map_file.write(encode_map(data))
+
+
+def open_map(path: Path) -> MapFile:
+    logging.getLogger(__name__).debug("Opening map: %s", path)
+    return MapFile(path)
+
+
+def encode_source(data: MapData) -> str:
+    """An editable JSON source for data, one grid row per line."""
+    rows = [" ".join(str(tile_id) for tile_id in
+                     data.tile_ids[y * data.width:(y + 1) * data.width])
+            for y in range(data.height)]
+    source = {"offset": list(data.offset), "chunk_tiles": data.chunk_tiles}
+    source.update(metadata_of(data))
+    del source["exits"]
+    lines = [f"  {json.dumps(key)}: {json.dumps(value)}," for key, value in source.items()]
+    lines.append('  "grid": [')
+    lines.append(",\n".join(f"    {json.dumps(row)}" for row in rows))
+    lines.append("  ]")
+    return "{\n" + "\n".join(lines) + "\n}\n"
+
+
+def decode_source(text: str, destinations: Mapping[int, str]) -> MapData:
+    """Parses a map source. destinations names the map each exit tile id
+    leads to; every tile with one of those ids becomes an exit."""
+    source = json.loads(text)
+    rows = [[int(tile_id) for tile_id in row.split()] for row in source["grid"]]
+    width = len(rows[0]) if rows else 0
+    if any(len(row) != width for row in rows):
+        raise ValueError("every grid row must have the same number of tiles")
+    source["exits"] = [[x, y, destinations[tile_id]]
+                       for y, row in enumerate(rows)
+                       for x, tile_id in enumerate(row) if tile_id in destinations]
+    tile_ids = array.array("H", (tile_id for row in rows for tile_id in row))
+    return map_data(width, len(rows), tuple(source["offset"]), source,
+                    source.get("chunk_tiles", DEFAULT_CHUNK_TILES), tile_ids)
+
+
+def build_maps(directory: Path, destinations: Mapping[int, str]) -> list[Path]:
+    """Writes a map file for every map source in directory."""
+    built = []
+    for source in sorted(directory.glob("*" + SOURCE_SUFFIX)):
+        target = source.with_name(source.name[:-len(SOURCE_SUFFIX)] + MAP_SUFFIX)
+        write_map(target, decode_source(source.read_text(), destinations))
+        built.append(target)
+    return built
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--dump":
+        source = source_path(sys.argv[2])
+        source.write_text(encode_source(open_map(map_path(sys.argv[2])).read_all()))
+        print(f"Wrote {source}")
+    else:
+        from prism.areamap import tile_types
+        exit_tiles = {type_id: tile_type.dest_areamap.name
+                      for type_id, tile_type in tile_types.items()
+                      if tile_type.dest_areamap is not None}
+        for target in build_maps(maps_directory(), exit_tiles):
+            print(f"Wrote {target}")
@@ -10,7 +10,7 @@ import typing
 import os
 import enum
 
-from prism import engine
+from prism import engine, fonts
 from prism.text_formatter import get_menu_word_size
 from prism.stat import Stat
 
@@ -27,15 +27,9 @@ AQUA = sdl2.SDL_Color(30, 190, 210)
 BLACK = sdl2.SDL_Color(0, 0, 0)
 WHITE = sdl2.SDL_Color(255, 255, 255)
 
-FONT_FILENAME = "Basic-Regular.ttf"
 FONTSIZE = 40
 
 
-def init_font(size: int):
-    with importlib.resources.path('prism.resources',
-                                  FONT_FILENAME) as path:
-        return sdl2.sdlttf.TTF_OpenFont(str.encode(os.fspath(path)), size)
-
 @enum.unique
 class OptionType(enum.IntEnum):
     POKEMON = 0
@@ -59,7 +53,7 @@ class MenuScene(engine.Scene):
         self.selected_option = 0
         self.scene_manager = scene_manager
         self.menu_region = self.region.subregion(15, 15, 200, 320)
-        self.font = init_font(FONTSIZE)
+        self.font = fonts.get_font(FONTSIZE).sdl_font
         self.option_branch = {0: self.select_pokemon, 1: self.select_bag, 2: self.select_trainer, 3: self.select_map, 4: self.select_settings, 5: self.select_exit}
         
     def set_player(self, player: "Player"):
@@ -68,8 +62,8 @@ class MenuScene(engine.Scene):
     def full_render(self):
         self.menu_region.clear()
         
-        outer_box = self.sprite_factory.from_color(AQUA, self.menu_region.size())
-        inner_box = self.sprite_factory.from_color(WHITE, (self.menu_region.size()[0] - 8, self.menu_region.size()[1] - 8))
+        outer_box = self.sprite_pool.from_color(AQUA, self.menu_region.size())
+        inner_box = self.sprite_pool.from_color(WHITE, (self.menu_region.size()[0] - 8, self.menu_region.size()[1] - 8))
 
         for i in range(6):
             
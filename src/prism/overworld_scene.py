@@ -1,6 +1,8 @@
 from pathlib import Path
-from typing import Tuple, Callable
+from typing import Tuple, Callable, Optional
+import logging
 import queue
+import threading
 import sdl2
 import sdl2.ext
 import sdl2.surface
@@ -9,8 +11,10 @@ import importlib.resources
 import typing
 
 from prism import engine
+from prism.camera import Camera
 from prism.player import Player
-from prism.areamap import get_image_from_path, map_db
+from prism.areamap import map_db, tile_types, world_atlas, CHUNK_SIZE, ITEM, OCCUPIED, PLAYER_OCCUPIED, TILE_SIZE
+from prism.assets import get_image_from_path
 from prism.mapname import MapName
 from prism.portal import Portal
 
@@ -23,8 +27,10 @@ def get_path(file_name: str) -> Path:
         return path
 
 
-TILE_SIZE = 40
 BASE_MOVEMENT_SPEED = 8
+PREFETCH_RADIUS = 3
+STREAM_RADIUS = 2
+VIEWPORT_SIZE = (800, 700)
 
 BLUE = sdl2.SDL_Color(0, 0, 255)
 RED = sdl2.SDL_Color(255, 0, 0)
@@ -101,6 +107,150 @@ class DirectionQueue(queue.LifoQueue):
                 self.queue.append(q_item)
 
 
+def warm_map(name: MapName):
+    """Reads the map called name and builds the surfaces the overworld needs
+    to draw it, baking the ground chunks visible from each of its portals.
+    Items are warmed from the tile types of those chunks, since a map that
+    is not current has no chunks installed."""
+    area_map = map_db[name]
+    width, height = VIEWPORT_SIZE
+    atlas = world_atlas()
+    for x, y in area_map.portals.values():
+        for chunk in area_map.chunks_in_rect(x * TILE_SIZE - width // 2,
+                                             y * TILE_SIZE - height // 2,
+                                             width, height):
+            area_map.chunk_surface(*chunk)
+            for type_id in set(area_map.read_chunk(*chunk) or ()):
+                item = tile_types[type_id].item
+                if item:
+                    atlas.surface(item.image_name)
+    for actor in area_map.actors:
+        atlas.surface(actor.image_name)
+    for image in area_map.foreground_items.values():
+        engine.SURFACE_CACHE.get_surface(image)
+
+
+class MapPrefetcher:
+    """Reads and warms maps reachable through nearby portals on background
+    threads, so the frames after a map change find their surfaces already
+    built."""
+    radius: int
+    last_position: Tuple
+    in_range: set[MapName]
+    _threads: dict[MapName, threading.Thread]
+
+    def __init__(self, radius: int = PREFETCH_RADIUS):
+        self.radius = radius
+        self.last_position = ()
+        self.in_range = set()
+        self._threads = {}
+
+    def approach(self, area_map: "AreaMap", x: int, y: int):
+        if self.last_position == (area_map, x, y):
+            return
+        self.last_position = (area_map, x, y)
+        self._threads = {dest: thread for dest, thread in self._threads.items()
+                         if thread.is_alive()}
+        # Only maps that just came into range are warmed; walking around
+        # near a portal does not warm its map again.
+        in_range = set(area_map.exits_near(x, y, self.radius))
+        entering = in_range - self.in_range
+        self.in_range = in_range
+        for dest in entering:
+            if dest not in self._threads:
+                thread = threading.Thread(target=warm_map, args=(dest,),
+                                          name=f"prefetch-{dest.name.lower()}",
+                                          daemon=True)
+                self._threads[dest] = thread
+                thread.start()
+
+    def finish(self, dest: MapName):
+        """Waits for any prefetch of dest that is still in flight."""
+        thread = self._threads.pop(dest, None)
+        if thread is not None:
+            thread.join()
+
+
+class ChunkStreamer:
+    """Keeps the chunks of the current map within radius chunks of the
+    player resident and unloads the rest, so map memory does not grow with
+    the size of the world. The player's own chunk is loaded at once; the
+    others are read on a background thread and installed on the main
+    thread the next time the player is checked, since installing a chunk
+    touches the actor index and sightlines."""
+    radius: int
+    area_map: Optional["AreaMap"]
+    last_chunk: Tuple
+    _requests: queue.Queue
+    _loaded: queue.Queue
+    _thread: Optional[threading.Thread]
+
+    def __init__(self, radius: int = STREAM_RADIUS):
+        self.radius = radius
+        self.area_map = None
+        self.last_chunk = ()
+        self._requests = queue.Queue()
+        self._loaded = queue.Queue()
+        self._thread = None
+
+    def approach(self, area_map: "AreaMap", x: int, y: int) -> bool:
+        """Streams chunks around x, y. Returns whether any chunk was
+        installed, since what is drawn from the map may have changed."""
+        installed = self.install_loaded()
+        chunk_x, chunk_y = area_map.chunk_of((x, y))
+        if self.last_chunk == (area_map, chunk_x, chunk_y):
+            return installed
+        if self.area_map is not None and self.area_map is not area_map:
+            self.area_map.unload_all()
+        self.area_map = area_map
+        self.last_chunk = (area_map, chunk_x, chunk_y)
+        area_map.load_chunk(chunk_x, chunk_y)
+        area_map.unload_beyond(chunk_x, chunk_y, self.radius + 1)
+        for chunk in area_map.chunks_near(chunk_x, chunk_y, self.radius):
+            if chunk not in area_map.chunks:
+                self._requests.put((area_map, chunk))
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run,
+                                            name="chunk-streamer", daemon=True)
+            self._thread.start()
+        return True
+
+    def wanted(self, area_map: "AreaMap", chunk: Tuple[int, int]) -> bool:
+        """Whether chunk is still within radius of the player. Requests the
+        player has walked away from since are dropped."""
+        if area_map is not self.area_map:
+            return False
+        _, chunk_x, chunk_y = self.last_chunk
+        return max(abs(chunk[0] - chunk_x),
+                   abs(chunk[1] - chunk_y)) <= self.radius
+
+    def install_loaded(self) -> bool:
+        """Installs the chunks the background thread has read so far.
+        Returns whether there were any."""
+        installed = False
+        while True:
+            try:
+                area_map, chunk, tile_ids = self._loaded.get_nowait()
+            except queue.Empty:
+                return installed
+            if self.wanted(area_map, chunk):
+                area_map.install_chunk(*chunk, tile_ids)
+                installed = True
+
+    def _run(self):
+        while True:
+            area_map, chunk = self._requests.get()
+            try:
+                if not self.wanted(area_map, chunk) or chunk in area_map.chunks:
+                    continue
+                tile_ids = area_map.read_chunk(*chunk)
+                if tile_ids is not None:
+                    self._loaded.put((area_map, chunk, tile_ids))
+            except Exception:
+                logging.getLogger(__name__).exception(
+                    "Could not read chunk %s", chunk)
+
+
 class OverworldScene(engine.Scene):
 
     player: "Player"
@@ -117,13 +267,31 @@ class OverworldScene(engine.Scene):
     event_running: bool
     menu_opening: bool
     running_events: list[Callable]
+    camera: Camera
+    prefetcher: MapPrefetcher
+    streamer: ChunkStreamer
+    background_region: engine.Region
+    map_region: engine.Region
+    actor_region: engine.Region
+    player_region: engine.Region
+    foreground_region: engine.Region
+    rendered_camera: Tuple
+    rendered_actors: Tuple
 
     def __init__(self, scene_manager, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.scene_manager = scene_manager
-        self.player = Player(self.sprite_factory.from_surface(self.get_scaled_surface(get_image_from_path("player.png")), free=True))
+        self.asset_names.append("player.png")
+        self.player = Player(self.sprite_factory.from_surface(self.get_scaled_surface(get_image_from_path("player.png"))))
         self.background_sprite = self.sprite_factory.from_color(
             BLACK, (800, 700))
+        self.background_region = self.region.subregion(0, 0, 800, 700)
+        self.map_region = self.region.subregion(0, 0, 800, 700)
+        self.actor_region = self.region.subregion(0, 0, 800, 700)
+        self.player_region = self.region.subregion(0, 0, 800, 700)
+        self.foreground_region = self.region.subregion(0, 0, 800, 700)
+        self.rendered_camera = ()
+        self.rendered_actors = ()
         self.player.x = 1
         self.player.y = 1
         self.menu_opening = False
@@ -133,6 +301,9 @@ class OverworldScene(engine.Scene):
         self.stored_direction = DirectionQueue()
         self.player.movement_remaining = 0
         self.player.moving = False
+        self.camera = Camera(self.player.x, self.player.y)
+        self.prefetcher = MapPrefetcher()
+        self.streamer = ChunkStreamer()
         self.change_map(map_db[MapName.TEST])
         self.held_movement_keys = 0
         self.left_held = False
@@ -146,99 +317,85 @@ class OverworldScene(engine.Scene):
         
 
     def change_map(self, new_map: "AreaMap"):
-        self.current_map = new_map    
+        self.streamer.approach(new_map, self.player.x, self.player.y)
+        self.current_map = new_map
+        self.map_region.invalidate()
+        self.actor_region.invalidate()
+        self.foreground_region.invalidate()
+
+    def screen_position(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        """Where the tile at position is drawn this frame."""
+        return (self.camera.screen_x(position[0]) + self.current_map.x_offset,
+                self.camera.screen_y(position[1]) + self.current_map.y_offset)
+
+    def camera_state(self) -> Tuple:
+        return (self.current_map, self.camera.x, self.camera.y,
+                self.current_map.x_offset, self.current_map.y_offset)
+
+    def actor_state(self) -> Tuple:
+        return tuple((actor.position, actor.dest_x, actor.dest_y,
+                      actor.x_movement_remaining, actor.y_movement_remaining)
+                     for actor in self.current_map.actors)
+
+    def invalidate_moved_regions(self):
+        """Invalidates whatever the camera or an actor moved since the last
+        render. While nothing moves, rendering rebuilds nothing."""
+        camera = self.camera_state()
+        if camera != self.rendered_camera:
+            self.map_region.invalidate()
+            self.actor_region.invalidate()
+            self.foreground_region.invalidate()
+            self.rendered_camera = camera
+        actors = self.actor_state()
+        if actors != self.rendered_actors:
+            self.actor_region.invalidate()
+            self.rendered_actors = actors
 
     def full_render(self):
-        self.region.clear()
-        self.region.add_sprite(self.background_sprite, 0, 0)
-        self.render_map()
-        self.render_actors()
-        self.render_player()
-        self.render_foreground()
+        self.invalidate_moved_regions()
+        if self.background_region.dirty:
+            self.render_background()
+        if self.map_region.dirty:
+            self.render_map()
+        if self.actor_region.dirty:
+            self.render_actors()
+        if self.player_region.dirty:
+            self.render_player()
+        if self.foreground_region.dirty:
+            self.render_foreground()
 
 
 
     def check_for_player_movement(self):
-        
+        self.prefetcher.approach(self.current_map, self.player.x, self.player.y)
+        if self.streamer.approach(self.current_map, self.player.x, self.player.y):
+            self.map_region.invalidate()
         if self.player.moving and not self.event_running:
             done = False
             continuing = False
             turning = False
             resetting = False
-            for tile in self.current_map:
-                if moving_sideways(self.player.direction):
-                    if tile.x_movement_remaining > 0:
-                        if not self.player.bonking:
-                            tile.x_movement_remaining -= BASE_MOVEMENT_SPEED
-                    if tile.x_movement_remaining == 0 or self.player.bonking:
-                        if tile.player_occupied and self.current_map[(self.player.x, self.player.y)] != tile:
-                            tile.player_occupied = False
-                        tile.grid_x = tile.dest_x
-                        if self.reset_direction:
-                            self.reset_direction = False
-                            resetting = True
-                        if not self.direction_walkable(
-                                self.player.direction) or (
-                                    self.stored_direction.waiting()
-                                    and not self.direction_walkable(
-                                        self.stored_direction.peek())):
-                            self.player.bonking = True
-                        if self.movement_held and self.player.direction != (
-                                0, 0) and (
-                                    self.direction_walkable(
-                                        self.player.direction)
-                                    or self.player.bonking) and not resetting:
-                            continuing = True
-                            done = False
-                        elif self.movement_held and self.stored_direction.waiting(
-                        ) and (self.direction_walkable(
-                                self.stored_direction.peek())
-                               or self.player.bonking):
-                            turning = True
-                            continuing = True
-                            done = False
-                        else:
-                            done = True
-                            continuing = False
-                        tile.x_movement_remaining = 40
-                if moving_vertically(self.player.direction):
-                    if tile.y_movement_remaining > 0:
-                        if not self.player.bonking:
-                            tile.y_movement_remaining -= BASE_MOVEMENT_SPEED
-                    if tile.y_movement_remaining == 0 or self.player.bonking:
-                        if tile.player_occupied and self.current_map[(self.player.x, self.player.y)] != tile:
-                            tile.player_occupied = False
-                        tile.grid_y = tile.dest_y
-                        if self.reset_direction:
-                            self.reset_direction = False
-                            resetting = True
-                        if not self.direction_walkable(
-                                self.player.direction) or (
-                                    self.stored_direction.waiting()
-                                    and not self.direction_walkable(
-                                        self.stored_direction.peek())):
-                            self.player.bonking = True
-                        if self.movement_held and self.player.direction != (
-                                0, 0) and (
-                                    self.direction_walkable(
-                                        self.player.direction)
-                                    or self.player.bonking) and not resetting:
-                            continuing = True
-                            done = False
-                        elif self.movement_held and self.stored_direction.waiting(
-                        ) and (self.direction_walkable(
-                                self.stored_direction.peek())
-                               or self.player.bonking):
-                            turning = True
-                            continuing = True
-                            done = False
-                        else:
-                            done = True
-                            continuing = False
-                        tile.y_movement_remaining = 40
+            camera = self.camera
+            if moving_sideways(self.player.direction):
+                if camera.x_movement_remaining > 0 and not self.player.bonking:
+                    camera.x_movement_remaining -= BASE_MOVEMENT_SPEED
+                if camera.x_movement_remaining == 0 or self.player.bonking:
+                    camera.finish_x()
+                    done, continuing, turning, resetting = self.end_step(
+                        turning, resetting)
+            if moving_vertically(self.player.direction):
+                if camera.y_movement_remaining > 0 and not self.player.bonking:
+                    camera.y_movement_remaining -= BASE_MOVEMENT_SPEED
+                if camera.y_movement_remaining == 0 or self.player.bonking:
+                    camera.finish_y()
+                    done, continuing, turning, resetting = self.end_step(
+                        turning, resetting)
             if turning:
                 self.player.set_direction(self.stored_direction.get())
-            if (done or continuing) and (self.player.x, self.player.y) in self.current_map.events:
+            if (done or continuing) and self.spotted_by_trainer():
+                self.player.moving = False
+                self.player.bonking = False
+            elif (done or continuing) and (self.player.x, self.player.y) in self.current_map.events:
                 self.player.moving = False
                 self.event_running = True
                 self.player.bonking = False
@@ -258,37 +415,67 @@ class OverworldScene(engine.Scene):
                     self.player.bonking = False
                     if moving_sideways(self.player.direction):
                         if moving_right(self.player.direction):
-                            for tile in self.current_map:
-                                tile.dest_x = tile.dest_x - 1
+                            self.camera.dest_x += 1
                             self.player.x += 1
                         elif moving_left(self.player.direction):
-                            for tile in self.current_map:
-                                tile.dest_x = tile.dest_x + 1
+                            self.camera.dest_x -= 1
                             self.player.x -= 1
                     if moving_vertically(self.player.direction):
                         if moving_up(self.player.direction):
-                            for tile in self.current_map:
-                                tile.dest_y = tile.dest_y + 1
+                            self.camera.dest_y -= 1
                             self.player.y -= 1
                         elif moving_down(self.player.direction):
-                            for tile in self.current_map:
-                                tile.dest_y = tile.dest_y - 1
+                            self.camera.dest_y += 1
                             self.player.y += 1
-                    self.current_map[(self.player.x, self.player.y)].player_occupied = True
+                    self.current_map.occupy_player((self.player.x, self.player.y))
             if self.player.direction == (0, 0):
                 self.player.moving = False
 
+    def spotted_by_trainer(self) -> bool:
+        """Starts the battle script of the first aggressive actor that can
+        see the player's tile and has not battled the player yet."""
+        if self.scene_manager.active_event is not None:
+            return False
+        for actor in self.current_map.watchers_of((self.player.x, self.player.y)):
+            if not actor.spotted_player and actor.battle_script:
+                self.scene_manager.start_event(actor.battle_script,
+                                               (actor, self))
+                return True
+        return False
+
+    def end_step(self, turning: bool,
+                 resetting: bool) -> Tuple[bool, bool, bool, bool]:
+        """Decides what follows a finished step. Returns done, continuing,
+        turning and resetting."""
+        self.current_map.vacate_player((self.player.x, self.player.y))
+        if self.reset_direction:
+            self.reset_direction = False
+            resetting = True
+        if not self.direction_walkable(self.player.direction) or (
+                self.stored_direction.waiting() and not self.direction_walkable(
+                    self.stored_direction.peek())):
+            self.player.bonking = True
+        if self.movement_held and self.player.direction != (0, 0) and (
+                self.direction_walkable(self.player.direction)
+                or self.player.bonking) and not resetting:
+            return False, True, turning, resetting
+        if self.movement_held and self.stored_direction.waiting() and (
+                self.direction_walkable(self.stored_direction.peek())
+                or self.player.bonking):
+            return False, True, True, resetting
+        return True, False, turning, resetting
+
     def check_for_actor_movement(self):
+        sightlines_changed = False
         for actor in self.current_map.actors:
             done = False
             if actor.movement_script:
                 actor.movement_script(self, actor)
             if actor.moving:
                 dest_point = (actor.position[0] + actor.direction[0], actor.position[1] + actor.direction[1])
-                dest_tile = self.current_map[dest_point]
-                if not dest_tile.player_occupied:
+                if not self.current_map.has_flag(dest_point, PLAYER_OCCUPIED):
                     actor.interactable = False
-                    dest_tile.occupied = True
+                    self.current_map.set_flag(dest_point, OCCUPIED)
                     if actor.direction[0] != 0:
                         actor.x_movement_remaining -= actor.movement_speed
 
@@ -302,58 +489,78 @@ class OverworldScene(engine.Scene):
                             done = True
                             actor.y_movement_remaining = 40
                     if done:
-                        self.current_map[actor.position].occupied = False
+                        self.current_map.clear_flag(actor.position, OCCUPIED)
                         actor.position = (actor.dest_x, actor.dest_y)
-                        self.current_map[actor.position].occupied = True
-                        self.current_map[actor.position].actor = actor
+                        self.current_map.set_flag(actor.position, OCCUPIED)
+                        self.current_map.actor_index.move(actor, actor.position)
+                        self.current_map.turn_actor(actor, actor.direction)
+                        sightlines_changed = True
                         actor.moving = False
                         actor.interactable = True
+        # A player mid-step is checked when the step ends.
+        if sightlines_changed and not self.player.moving and not self.event_running:
+            self.spotted_by_trainer()
             
 
     def event_check(self):
         if (self.player.x, self.player.y) in self.current_map.events:
             self.current_map.events[(self.player.x, self.player.y)](self.player, self.current_map, self)
 
+    def render_background(self):
+        self.background_region.clear_sprites()
+        self.background_region.add_sprite(self.background_sprite, 0, 0)
+        self.background_region.mark_clean()
+
     def render_map(self):
-        for i in range(self.current_map.height):
-            for j in range(self.current_map.width):
-                self.region.add_sprite(
-                    self.sprite_factory.from_surface(
-                        self.get_scaled_surface(self.current_map[(i,
-                                                                  j)].image), free=True),
-                    self.current_map[(i, j)].x + self.current_map.x_offset,
-                    self.current_map[(i, j)].y + self.current_map.y_offset)
-                if self.current_map[(i, j)].item:
-                    self.region.add_sprite(
-                    self.sprite_factory.from_surface(self.get_scaled_surface(self.current_map[(i, j)].item.image), free=True),
-                    self.current_map[(i, j)].x + self.current_map.x_offset, self.current_map[(i, j)].y + self.current_map.y_offset)
+        self.map_region.clear_sprites()
+        origin_x, origin_y = self.screen_position((0, 0))
+        viewport = (-origin_x, -origin_y, *VIEWPORT_SIZE)
+        for chunk_x, chunk_y in self.current_map.chunks_in_rect(*viewport):
+            self.map_region.add_sprite(
+                self.sprite_pool.wrap(
+                    self.current_map.chunk_surface(chunk_x, chunk_y)),
+                origin_x + chunk_x * CHUNK_SIZE,
+                origin_y + chunk_y * CHUNK_SIZE)
+        atlas = world_atlas()
+        for position in self.current_map.tiles_in_rect(*viewport):
+            tile = self.current_map[position]
+            if tile.item:
+                self.map_region.add_sprite(
+                    self.sprite_from_atlas(atlas, tile.item.image_name),
+                    *self.screen_position(position))
+        self.map_region.mark_clean()
                 
     def render_actors(self):
+        self.actor_region.clear_sprites()
+        atlas = world_atlas()
         for actor in self.current_map.actors:
+            tile_x, tile_y = self.screen_position(actor.position)
             if actor.dest_x > actor.position[0]:
-                sprite_x = self.current_map[(actor.position[0], actor.position[1])].x + self.current_map.x_offset + (40 - actor.x_movement_remaining)
+                sprite_x = tile_x + (40 - actor.x_movement_remaining)
             else:
-                sprite_x = self.current_map[(actor.position[0], actor.position[1])].x + self.current_map.x_offset - (40 - actor.x_movement_remaining)
+                sprite_x = tile_x - (40 - actor.x_movement_remaining)
             if actor.dest_y > actor.position[1]:
-                sprite_y = self.current_map[(actor.position[0], actor.position[1])].y + self.current_map.y_offset - 5 + (40 - actor.y_movement_remaining)
+                sprite_y = tile_y - 5 + (40 - actor.y_movement_remaining)
             else:
-                sprite_y = self.current_map[(actor.position[0], actor.position[1])].y + self.current_map.y_offset - 5 - (40 - actor.y_movement_remaining)
-            self.region.add_sprite(
-                    self.sprite_factory.from_surface(
-                        self.get_scaled_surface(actor.image), free=True),
+                sprite_y = tile_y - 5 - (40 - actor.y_movement_remaining)
+            self.actor_region.add_sprite(
+                    self.sprite_from_atlas(atlas, actor.image_name),
                     sprite_x,
                     sprite_y)
+        self.actor_region.mark_clean()
 
     def render_player(self):
-        self.region.add_sprite(self.player.sprite, 240, 240 - 5)
+        self.player_region.clear_sprites()
+        self.player_region.add_sprite(self.player.sprite, 240, 240 - 5)
+        self.player_region.mark_clean()
 
     def render_foreground(self):
+        self.foreground_region.clear_sprites()
         for k, v in self.current_map.foreground_items.items():
-            self.region.add_sprite(
-                    self.sprite_factory.from_surface(
-                        self.get_scaled_surface(v), free=True),
-                    self.current_map[k].x + self.current_map.x_offset,
-                    self.current_map[k].y + self.current_map.y_offset)
+            self.foreground_region.add_sprite(
+                    self.sprite_pool.wrap(self.get_scaled_surface(v)),
+                    *self.screen_position(k))
+        self.foreground_region.mark_clean()
 
     def begin_movement(self, direction: Tuple[int, int]):
         if not self.player.moving and not self.movement_held and not self.event_running:
@@ -362,14 +569,12 @@ class OverworldScene(engine.Scene):
                     direction = self.current_map[(self.player.x, self.player.y)].ramp_direction
             self.player.set_direction(direction)
             if self.direction_walkable(self.player.direction):
-                for tile in self.current_map:
-                    tile.dest_x = tile.grid_x - direction[0]
-                    tile.dest_y = tile.grid_y - direction[1]
+                self.camera.begin_step(direction)
                 self.player.moving = True
                 self.player.bonking = False
                 self.player.x += direction[0]
                 self.player.y += direction[1]
-                self.current_map[(self.player.x, self.player.y)].player_occupied = True
+                self.current_map.occupy_player((self.player.x, self.player.y))
                 self.full_render()
             else:
                 self.player.bonking = True
@@ -407,15 +612,18 @@ class OverworldScene(engine.Scene):
     def pressed_interact(self):
         target_square = ((self.player.x + self.player.direction[0]),
                               (self.player.y + self.player.direction[1]))
-        if self.current_map[target_square].has_item:
-            self.current_map[target_square].item.pickup_script(self, self.current_map[target_square].item)
-            self.current_map[target_square].item = None
+        if self.current_map.has_flag(target_square, ITEM):
+            item = self.current_map.take_item(target_square)
+            item.pickup_script(self, item)
+            self.map_region.invalidate()
             self.full_render()
-        elif self.current_map[target_square].occupied and self.current_map[target_square].actor.interactable:
-            if self.current_map[target_square].actor.battle_ready:
-                self.scene_manager.start_event(self.current_map[target_square].actor.battle_script, (self.current_map[target_square].actor, self))
+            return
+        actor = self.current_map.actor_index.at(target_square)
+        if actor is not None and actor.interactable:
+            if actor.battle_ready:
+                self.scene_manager.start_event(actor.battle_script, (actor, self))
             else:
-                self.current_map[target_square].actor.dialogue_script(self)
+                actor.dialogue_script(self)
 
     def released_down(self):
         self.down_held = False
@@ -480,7 +688,7 @@ class OverworldScene(engine.Scene):
     def direction_walkable(self, direction: Tuple[int, int]) -> bool:
         destination_square = ((self.player.x + direction[0]),
                               (self.player.y + direction[1]))
-        return self.current_map[destination_square].walkable and not self.current_map[destination_square].has_item and not self.current_map[destination_square].occupied
+        return self.current_map.is_passable(destination_square)
 
     def pressed_inventory(self):
         for item in self.player.bag:
@@ -3,16 +3,12 @@ import sdl2
 import sdl2.ext
 from typing import Tuple
 import typing
-from prism.poke_db import initialize_pokemon
-from prism.abi_db import initialize_abilities
 from prism.pokemon import pokespawn
 
 if typing.TYPE_CHECKING:
     from prism.areamap import Item
     from prism.pokemon import Pokemon
 
-abi_db = initialize_abilities()
-
 class Player:
     sprite: sdl2.ext.SoftwareSprite
     x: int
@@ -5,7 +5,6 @@ from prism import ability
 import typing
 from .ptypes import PokemonType
 from .passive import Passive
-from . import abi_db
 
 if typing.TYPE_CHECKING:
     from prism.pokemon import Pokemon
@@ -19,8 +18,6 @@ def create_move_pool(database: Dict, *args: str) -> list:
 
 def initialize_pokemon() -> Dict[str, "Pokemon"]:
 
-    ability_db = abi_db.initialize_abilities()
-
     poke_db = {}
     poke_db["slowbro"] = ("Slowbro", (PokemonType.WATER, PokemonType.PSYCHIC), 75,110,100,80,30,95, (Passive.OBLIVIOUS, Passive.OWN_TEMPO, Passive.REGENERATOR))
     poke_db["garchomp"] = ("Garchomp", (PokemonType.DRAGON, PokemonType.GROUND), 130, 95, 80, 85, 102, 108, (Passive.SAND_VEIL, Passive.ROUGH_SKIN))
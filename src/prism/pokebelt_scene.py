@@ -7,19 +7,12 @@ import typing
 from PIL import Image
 import os
 from typing import Tuple
-from prism import engine, text_formatter
+from prism import engine, fonts, text_formatter
 import enum
 import random
 from prism.stat import Stat
-
-def init_font(size: int):
-    with importlib.resources.path('prism.resources',
-                                  FONT_FILENAME) as path:
-        return sdl2.sdlttf.TTF_OpenFont(str.encode(os.fspath(path)), size)
-
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
+from prism.assets import get_image_from_path
+from prism.pokemon import species_sprite_name
 
 BLUE = sdl2.SDL_Color(70, 70, 255)
 RED = sdl2.SDL_Color(255, 0, 0)
@@ -39,7 +32,8 @@ class BeltState(enum.IntEnum):
     SELECTING_OPTION = 1
 
 NAMEPLATE_FONT_SIZE = 22
-FONT_FILENAME = "Basic-Regular.ttf"
+HP_BAR_BACK = "belt_hp_back.png"
+HP_BAR_FRONT = "enemy_health_bar.png"
 
 class PokeBeltScene(engine.Scene):
 
@@ -51,40 +45,45 @@ class PokeBeltScene(engine.Scene):
     selected_slot: int
     belt_state: BeltState
     nameplate_font: sdl2.sdlttf.TTF_Font
-    hp_bar_back: Image.Image
-    hp_bar_front: Image.Image
 
     def __init__(self, scene_manager, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.scene_manager = scene_manager
-        self.nameplate_font = init_font(NAMEPLATE_FONT_SIZE)
+        self.nameplate_font = fonts.get_font(NAMEPLATE_FONT_SIZE).sdl_font
         self.selected_slot = 0
         forced = False
         in_battle = False
-        self.hp_bar_back = get_image_from_path("belt_hp_back.png")
-        self.hp_bar_front = get_image_from_path("enemy_health_bar.png")
+        self.asset_names.extend([HP_BAR_BACK, HP_BAR_FRONT])
         self.belt_state = BeltState.SELECTING_POKEMON
         self.poke_display_region = self.region.subregion(0, 55, 380, 600)
 
+    @property
+    def hp_bar_back(self) -> Image.Image:
+        return get_image_from_path(HP_BAR_BACK)
+
+    @property
+    def hp_bar_front(self) -> Image.Image:
+        return get_image_from_path(HP_BAR_FRONT)
+
     def full_render(self):
         self.region.clear()
-        background = self.sprite_factory.from_color(BLACK, (800,700))
+        background = self.sprite_pool.from_color(BLACK, (800,700))
         self.region.add_sprite(background, 0, 0)
         self.render_poke_display_region()
 
     def render_poke_display_region(self):
-        placeholder = self.sprite_factory.from_color(AQUA, self.poke_display_region.size())
+        placeholder = self.sprite_pool.from_color(AQUA, self.poke_display_region.size())
         self.poke_display_region.add_sprite(placeholder, 0, 0)
 
         for i in range(6):
             if self.selected_slot == i:
-                border = self.sprite_factory.from_color(RED, (356, 98))
+                border = self.sprite_pool.from_color(RED, (356, 98))
                 self.poke_display_region.add_sprite(border, 12, 7 + (i * 97))
-            pokeslot = self.sprite_factory.from_color(PURPLE, (350, 92))
+            pokeslot = self.sprite_pool.from_color(PURPLE, (350, 92))
             self.poke_display_region.add_sprite(pokeslot, 15, 10 + (i * 97))
 
         for i in range(len(self.player.team)):
-            poketile = self.sprite_factory.from_color(BLUE, (350, 92))
+            poketile = self.sprite_pool.from_color(BLUE, (350, 92))
 
             name_text = sdl2.sdlttf.TTF_RenderText_Blended(self.nameplate_font, str.encode(self.player.team[i].name), BLACK)
             sdl2.surface.SDL_BlitSurface(name_text, None, poketile.surface, sdl2.SDL_Rect(75, 3, 0, 0))
@@ -106,7 +105,6 @@ class PokeBeltScene(engine.Scene):
 
             belt_image = self.get_scaled_surface(self.player.team[i].belt_image)
             sdl2.surface.SDL_BlitSurface(belt_image, None, poketile.surface, sdl2.SDL_Rect(0, 15, 0, 0))
-            sdl2.SDL_FreeSurface(belt_image)
 
             self.poke_display_region.add_sprite(poketile, 15, 10 + (i * 97))
             
@@ -119,6 +117,9 @@ class PokeBeltScene(engine.Scene):
     def check_belt(self, player: "Player", in_battle: bool, forced: bool):
         self.in_battle = in_battle
         self.player = player
+        self.scene_manager.asset_cache.pin(
+            self, *(species_sprite_name(pokemon.database_name, "belt")
+                    for pokemon in player.team))
         self.selected_slot = 0
         self.forced = forced
         self.belt_state = BeltState.SELECTING_POKEMON
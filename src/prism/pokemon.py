@@ -3,14 +3,14 @@ from typing import Tuple, Optional
 import typing
 import random
 from PIL import Image
-from prism.abi_db import initialize_abilities
 from prism.status import StatusEffect, status_applied, is_greater_status
 from prism.stat import Stat
 from prism import ptypes
 from prism.ability import Ability, AbilityType, TargetingType
 from prism.passive import Passive
 import importlib.resources
-from prism.poke_db import initialize_pokemon
+from prism import registry
+from prism.assets import get_image_from_path
 
 
 
@@ -18,9 +18,23 @@ if typing.TYPE_CHECKING:
     from prism.battle import BattleSlot
     from prism.battle_scene import BattleScene
 
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
+missing_species_sprites: set[str] = set()
+
+def species_sprite_name(database_name: str, view: str) -> str:
+    return f"{database_name}_{view}.png"
+
+def get_species_sprite(database_name: str, view: str) -> Optional[Image.Image]:
+    """Fetches <species>_<view>.png from the shared asset cache, which keeps
+    one copy per species and may evict it once no scene uses it. Species
+    without that piece of art get None."""
+    file_name = species_sprite_name(database_name, view)
+    if file_name in missing_species_sprites:
+        return None
+    try:
+        return get_image_from_path(file_name)
+    except OSError:
+        missing_species_sprites.add(file_name)
+        return None
 
 def get_stat_mod(stages: int) -> float:
     over = 2
@@ -32,15 +46,12 @@ def get_stat_mod(stages: int) -> float:
     
     return over/under
 
-db = initialize_pokemon()
-adb = initialize_abilities()
-
 def pokespawn(database_name: str, level: int, moveset: list[str] = [], wild: bool = False) -> "Pokemon":
-    pokemon = Pokemon(*db[database_name])
+    pokemon = Pokemon(*registry.get_species(database_name))
     pokemon.set_level(level)
     if moveset:
         for move in moveset:
-            pokemon.learn_ability(adb[move])
+            pokemon.learn_ability(registry.get_ability(move))
 
     return pokemon
 
@@ -99,8 +110,6 @@ class Pokemon:
     move_pool: list[Ability]
     team: list["Pokemon"]
     level: int
-    front_image: Image.Image
-    back_image: Image.Image
     current_pp: list[int]
     sleep_duration: int
     action_failed: bool
@@ -123,20 +132,6 @@ class Pokemon:
         self.failed_paralyze = False
         self.failed_sleep = False
         self.passive = Passive.INTIMIDATE
-        try:
-            self.front_image = get_image_from_path(self.database_name + "_front.png")
-        except:
-            self.front_image = None
-        
-        try:
-            self.back_image = get_image_from_path(self.database_name + "_back.png")
-        except:
-            self.back_image = None
-        
-        try:
-            self.belt_image = get_image_from_path(self.database_name + "_belt.png")
-        except:
-            self.belt_image = None
 
         self.level = 1
         self.nature = "Serious"
@@ -183,6 +178,18 @@ class Pokemon:
         self.current_hp = self.get_stat(Stat.HP)
         self.display_hp = self.get_stat(Stat.HP)
 
+    @property
+    def front_image(self) -> Optional[Image.Image]:
+        return get_species_sprite(self.database_name, "front")
+
+    @property
+    def back_image(self) -> Optional[Image.Image]:
+        return get_species_sprite(self.database_name, "back")
+
+    @property
+    def belt_image(self) -> Optional[Image.Image]:
+        return get_species_sprite(self.database_name, "belt")
+
     def get_database_name(self, name:str) -> str:
         for char in name:
             if not char.isalpha():
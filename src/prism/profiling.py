@@ -0,0 +1,151 @@
+"""Cold-start profiling: wall time and allocations per import and per step.
+
+Enabled by ``python -m prism --profile-startup``. Timings are self times:
+work done by a nested import or step is charged to that entry, not to the
+one that triggered it. Allocations are the net bytes still allocated when
+the entry finishes, as traced by tracemalloc.
+"""
+import contextlib
+import importlib.abc
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Iterator, Optional, TextIO
+
+REPORT_WIDTH = 48
+
+
+@dataclass
+class ProfileEntry:
+    kind: str
+    name: str
+    total_seconds: float
+    self_seconds: float
+    total_bytes: int
+    self_bytes: int
+
+
+class _Frame:
+    started: float
+    start_bytes: int
+    child_seconds: float
+    child_bytes: int
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.start_bytes = tracemalloc.get_traced_memory()[0]
+        self.child_seconds = 0.0
+        self.child_bytes = 0
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Runs the real loader's exec_module inside a profiler measurement."""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self.loader = loader
+        self.profiler = profiler
+
+    def create_module(self, spec):
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        # Hand the module back to its own loader so resource readers and
+        # reloads never see this wrapper.
+        module.__loader__ = self.loader
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+        with self.profiler.measure("import", module.__name__):
+            self.loader.exec_module(module)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+
+    def __init__(self, profiler: "StartupProfiler"):
+        self.profiler = profiler
+
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self.profiler)
+        return spec
+
+
+class StartupProfiler:
+    """Collects ProfileEntry records between start() and stop(). A disabled
+    profiler accepts the same calls and records nothing."""
+    enabled: bool
+    entries: list[ProfileEntry]
+    _stack: list[_Frame]
+    _finder: Optional[_ImportTimer]
+    _started: float
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.entries = []
+        self._stack = []
+        self._finder = None
+        self._started = 0.0
+
+    def start(self):
+        if not self.enabled:
+            return
+        tracemalloc.start()
+        self._started = time.perf_counter()
+        self._finder = _ImportTimer(self)
+        sys.meta_path.insert(0, self._finder)
+
+    def stop(self):
+        if self._finder is not None:
+            sys.meta_path.remove(self._finder)
+            self._finder = None
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @contextlib.contextmanager
+    def measure(self, kind: str, name: str) -> Iterator[None]:
+        if not self.enabled:
+            yield
+            return
+        frame = _Frame()
+        self._stack.append(frame)
+        try:
+            yield
+        finally:
+            self._stack.pop()
+            total_seconds = time.perf_counter() - frame.started
+            total_bytes = tracemalloc.get_traced_memory()[0] - frame.start_bytes
+            self.entries.append(
+                ProfileEntry(kind, name, total_seconds,
+                             total_seconds - frame.child_seconds, total_bytes,
+                             total_bytes - frame.child_bytes))
+            if self._stack:
+                self._stack[-1].child_seconds += total_seconds
+                self._stack[-1].child_bytes += total_bytes
+
+    def ranked(self) -> list[ProfileEntry]:
+        return sorted(self.entries, key=lambda entry: entry.self_seconds,
+                      reverse=True)
+
+    def report(self, out: TextIO = sys.stdout, limit: Optional[int] = None):
+        elapsed = time.perf_counter() - self._started
+        peak = tracemalloc.get_traced_memory()[1] if tracemalloc.is_tracing() else 0
+        entries = self.ranked()
+        print(f"Startup: {elapsed * 1000:.1f} ms wall, "
+              f"{len(entries)} entries, peak traced {peak / 1024:.0f} KiB",
+              file=out)
+        print(f"{'kind':<8} {'name':<{REPORT_WIDTH}} {'self ms':>9} "
+              f"{'total ms':>9} {'self KiB':>9} {'total KiB':>9}", file=out)
+        for entry in entries[:limit]:
+            print(f"{entry.kind:<8} {entry.name[:REPORT_WIDTH]:<{REPORT_WIDTH}} "
+                  f"{entry.self_seconds * 1000:>9.2f} "
+                  f"{entry.total_seconds * 1000:>9.2f} "
+                  f"{entry.self_bytes / 1024:>9.1f} "
+                  f"{entry.total_bytes / 1024:>9.1f}", file=out)
@@ -0,0 +1,38 @@
+"""Move and species tables, built once on first lookup and shared by every
+module, so each move has exactly one Ability object."""
+import threading
+from typing import Optional
+
+from prism.ability import Ability
+from prism.abi_db import initialize_abilities
+from prism.poke_db import initialize_pokemon
+
+_abilities: Optional[dict[str, Ability]] = None
+_species: Optional[dict[str, tuple]] = None
+_lock = threading.Lock()
+
+
+def abilities() -> dict[str, Ability]:
+    global _abilities
+    if _abilities is None:
+        with _lock:
+            if _abilities is None:
+                _abilities = initialize_abilities()
+    return _abilities
+
+
+def species() -> dict[str, tuple]:
+    global _species
+    if _species is None:
+        with _lock:
+            if _species is None:
+                _species = initialize_pokemon()
+    return _species
+
+
+def get_ability(name: str) -> Ability:
+    return abilities()[name]
+
+
+def get_species(database_name: str) -> tuple:
+    return species()[database_name]
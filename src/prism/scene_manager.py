@@ -1,14 +1,11 @@
 import sdl2
 import sdl2.ext
-from typing import Iterable, Tuple, Optional, Callable
+from typing import Iterable, Tuple, Optional, Callable, MutableMapping
 import typing
 import importlib.resources
+import logging
 from PIL import Image
-
-
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
+from prism import assets, engine
 
 
 if typing.TYPE_CHECKING:
@@ -25,18 +22,16 @@ if typing.TYPE_CHECKING:
 class SceneManager:
     """Manager for all game scenes"""
     window: sdl2.ext.Window
-    spriterenderer: sdl2.ext.SpriteRenderSystem
+    renderer: engine.DirtyRectRenderer
     factory: sdl2.ext.SpriteFactory
     connected: bool
     surfaces: dict
     sounds: dict
     frame_count: int
+    asset_cache: assets.AssetCache
     active_scenes: list["Scene"]
-    dialogue: "DialogueScene"
-    overworld: "OverworldScene"
-    menu: "MenuScene"
-    battle: "BattleScene"
-    belt: "PokeBeltScene"
+    scene_factories: MutableMapping[str, Callable[["SceneManager"], "Scene"]]
+    scenes: MutableMapping[str, "Scene"]
     stored_prompt: str
     active_event: Optional[Callable]
     event_args: Tuple
@@ -46,6 +41,53 @@ class SceneManager:
     def current_scene(self):
         return self.active_scenes[-1]
 
+    @property
+    def overworld(self) -> "OverworldScene":
+        return self.get_scene("overworld")
+
+    @property
+    def dialogue(self) -> "DialogueScene":
+        return self.get_scene("dialogue")
+
+    @property
+    def menu(self) -> "MenuScene":
+        return self.get_scene("menu")
+
+    @property
+    def battle(self) -> "BattleScene":
+        return self.get_scene("battle")
+
+    @property
+    def belt(self) -> "PokeBeltScene":
+        return self.get_scene("belt")
+
+    def register_scene(self, name: str,
+                       factory: Callable[["SceneManager"], "Scene"]):
+        """Records how to build a scene; it is constructed on first use."""
+        self.scene_factories[name] = factory
+
+    def get_scene(self, name: str) -> "Scene":
+        if name not in self.scenes:
+            logging.getLogger(__name__).debug("Constructing scene: %s", name)
+            self.scenes[name] = self.scene_factories[name](self)
+        return self.scenes[name]
+
+    def scene_is_current(self, name: str) -> bool:
+        """Checks the current scene without constructing the named one."""
+        return name in self.scenes and self.current_scene is self.scenes[name]
+
+    def pending_scenes(self) -> list[str]:
+        return [name for name in self.scene_factories if name not in self.scenes]
+
+    def warm_next_scene(self) -> bool:
+        """Constructs one registered scene that has not been built yet, so
+        the cost is spread over frames. Returns False once all are built."""
+        pending = self.pending_scenes()
+        if not pending:
+            return False
+        self.get_scene(pending[0])
+        return True
+
     def renderables(self) -> Iterable[sdl2.ext.SoftwareSprite]:
         for scene in self.active_scenes:
             yield from scene.renderables()
@@ -55,21 +97,17 @@ class SceneManager:
         self.surfaces = {}
         self.sounds = {}
         self.active_scenes = []
+        self.scene_factories = {}
+        self.scenes = {}
         self.active_event = None
         self.event_phase = 1
         self.stored_prompt = ""
+        self.asset_cache = assets.CACHE
         if window:
             self.window = window
             self.factory = sdl2.ext.SpriteFactory(sdl2.ext.SOFTWARE,
                                                   free=False)
-            self.spriterenderer = self.factory.create_sprite_render_system(
-                window)
-
-        self.surfaces["test_grass"] = get_image_from_path(
-            "test_grass_tile.png")
-        self.surfaces["test_water"] = get_image_from_path(
-            "test_water_tile.png")
-        self.surfaces["test_rock"] = get_image_from_path("test_rock_tile.png")
+            self.renderer = engine.DirtyRectRenderer(window)
 
     def dispatch_key_press_event(self, key_event: int):
         self.current_scene.dispatch_key_press_event(key_event)
@@ -103,6 +141,8 @@ class SceneManager:
 
     def close_scene(self, scene):
         self.active_scenes.remove(scene)
+        if scene not in self.active_scenes:
+            self.asset_cache.release(scene)
 
     def start_dialogue(self, message: str, prompts: list[str] = []):
         self.set_scene_to_active(self.dialogue)
@@ -119,6 +159,10 @@ class SceneManager:
 
     def set_scene_to_active(self, scene):
         self.active_scenes.append(scene)
+        self.asset_cache.pin(scene, *scene.asset_names)
+
+    def asset_stats(self) -> assets.AssetStats:
+        return self.asset_cache.stats()
 
     def swap_pokemon(self, decision_slot: int):
         self.close_scene(self.belt)
@@ -126,12 +170,10 @@ class SceneManager:
 
     def change_window_size(self, new_width: int, new_height: int):
         sdl2.SDL_SetWindowSize(self.window.window, new_width, new_height)
-        self.spriterenderer = self.factory.create_sprite_render_system(
-            self.window)
+        self.renderer.invalidate()
 
     def create_new_window(self, size: Tuple[int, int], name: str):
         self.window.close()
         self.window = sdl2.ext.Window(name, size)
         self.window.show()
-        self.spriterenderer = self.factory.create_sprite_render_system(
-            self.window)
+        self.renderer = engine.DirtyRectRenderer(self.window)
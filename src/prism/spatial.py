@@ -0,0 +1,123 @@
+"""Spatial indexes of actors on a tile grid."""
+from typing import Callable, Hashable, MutableMapping, Optional, Tuple
+
+DEFAULT_CELL_TILES = 8
+
+
+class SpatialHash:
+    """Objects keyed by the tile they stand on, also bucketed into square
+    cells of cell_tiles tiles so area queries only visit nearby cells.
+    At most one object is indexed per tile."""
+    cell_tiles: int
+    _at: MutableMapping[Tuple[int, int], Hashable]
+    _positions: MutableMapping[Hashable, Tuple[int, int]]
+    _cells: MutableMapping[Tuple[int, int], set[Tuple[int, int]]]
+
+    def __init__(self, cell_tiles: int = DEFAULT_CELL_TILES):
+        self.cell_tiles = cell_tiles
+        self._at = {}
+        self._positions = {}
+        self._cells = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self._positions
+
+    def cell_of(self, position: Tuple[int, int]) -> Tuple[int, int]:
+        return position[0] // self.cell_tiles, position[1] // self.cell_tiles
+
+    def add(self, item: Hashable, position: Tuple[int, int]):
+        if item in self._positions:
+            self.remove(item)
+        displaced = self._at.get(position)
+        if displaced is not None:
+            self.remove(displaced)
+        self._at[position] = item
+        self._positions[item] = position
+        self._cells.setdefault(self.cell_of(position), set()).add(position)
+
+    def remove(self, item: Hashable):
+        position = self._positions.pop(item, None)
+        if position is None:
+            return
+        del self._at[position]
+        cell = self.cell_of(position)
+        self._cells[cell].discard(position)
+        if not self._cells[cell]:
+            del self._cells[cell]
+
+    def move(self, item: Hashable, position: Tuple[int, int]):
+        if self._positions.get(item) != position:
+            self.add(item, position)
+
+    def at(self, position: Tuple[int, int]) -> Optional[Hashable]:
+        return self._at.get(position)
+
+    def position_of(self, item: Hashable) -> Optional[Tuple[int, int]]:
+        return self._positions.get(item)
+
+    def in_rect(self, left: int, top: int, width: int,
+                height: int) -> list[Hashable]:
+        """Objects on tiles inside a rect given in tiles. Returns a list, so
+        callers may move or remove objects while going through it."""
+        right, bottom = left + width, top + height
+        first_x, first_y = self.cell_of((left, top))
+        last_x, last_y = self.cell_of((right - 1, bottom - 1))
+        found = []
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                for x, y in self._cells.get((cell_x, cell_y), ()):
+                    if left <= x < right and top <= y < bottom:
+                        found.append(self._at[(x, y)])
+        return found
+
+    def within_radius(self, position: Tuple[int, int],
+                      radius: int) -> list[Hashable]:
+        """Objects at most radius tiles away from position on both axes."""
+        return self.in_rect(position[0] - radius, position[1] - radius,
+                            2 * radius + 1, 2 * radius + 1)
+
+
+class SightlineIndex:
+    """Which watchers can see each tile. A watcher sees up to sight_range
+    tiles straight ahead of it, stopping at the first tile it cannot see
+    through. Lines are computed when a watcher is placed, moves or turns,
+    so asking who sees a tile is a single dict lookup. Not thread-safe;
+    AreaMap updates its index on the main thread under the map lock."""
+    watchers: MutableMapping[Tuple[int, int], list[Hashable]]
+    _lines: MutableMapping[Hashable, list[Tuple[int, int]]]
+
+    def __init__(self):
+        self.watchers = {}
+        self._lines = {}
+
+    def update(self, watcher: Hashable, position: Tuple[int, int],
+               facing: Tuple[int, int], sight_range: int,
+               see_through: Callable[[Tuple[int, int]], bool]):
+        self.remove(watcher)
+        line = []
+        x, y = position
+        for _ in range(sight_range):
+            if facing == (0, 0):
+                break
+            x, y = x + facing[0], y + facing[1]
+            if not see_through((x, y)):
+                break
+            line.append((x, y))
+            self.watchers.setdefault((x, y), []).append(watcher)
+        self._lines[watcher] = line
+
+    def remove(self, watcher: Hashable):
+        for position in self._lines.pop(watcher, ()):
+            watching = self.watchers[position]
+            watching.remove(watcher)
+            if not watching:
+                del self.watchers[position]
+
+    def line_of(self, watcher: Hashable) -> list[Tuple[int, int]]:
+        return self._lines.get(watcher, [])
+
+    def seen_by(self, position: Tuple[int, int]) -> list[Hashable]:
+        return self.watchers.get(position, [])
@@ -1,31 +1,22 @@
 from dataclasses import dataclass
-import importlib.resources
-from PIL import ImageFont
-import os
+from prism import fonts
 
-with importlib.resources.path('prism.resources', "Basic-Regular.ttf") as path:
-    FONT = ImageFont.truetype(os.fspath(path), size = 30)
-
-with importlib.resources.path('prism.resources', "Basic-Regular.ttf") as path:
-    MENU_FONT = ImageFont.truetype(os.fspath(path), size = 40)
-
-with importlib.resources.path('prism.resources', "Basic-Regular.ttf") as path:
-    BATTLE_MENU_FONT = ImageFont.truetype(os.fspath(path), size = 48)
-
-with importlib.resources.path('prism.resources', "Basic-Regular.ttf") as path:
-    ABILITY_FONT = ImageFont.truetype(os.fspath(path), size = 32)
+FONT_SIZE = 30
+MENU_FONT_SIZE = 40
+BATTLE_MENU_FONT_SIZE = 48
+ABILITY_FONT_SIZE = 32
 
 def get_word_size(word: str):
-    return FONT.getsize(word)[0]
+    return fonts.get_font(FONT_SIZE).width(word)
 
 def get_menu_word_size(word: str):
-    return MENU_FONT.getsize(word)[0]
+    return fonts.get_font(MENU_FONT_SIZE).width(word)
 
 def get_battle_menu_word_size(word: str):
-    return BATTLE_MENU_FONT.getsize(word)[0]
+    return fonts.get_font(BATTLE_MENU_FONT_SIZE).width(word)
 
 def get_ability_word_size(word: str):
-    return ABILITY_FONT.getsize(word)[0]
+    return fonts.get_font(ABILITY_FONT_SIZE).width(word)
 
 @dataclass
 class WordData:
@@ -37,10 +28,9 @@ def get_lines(input: str, max_width: int, fontsize: int) -> list[str]:
     words = input.split()
     word_data = []
     length = 0
-    with importlib.resources.path('prism.resources', "Basic-Regular.ttf") as path:
-            FONT = ImageFont.truetype(os.fspath(path), size = fontsize)
+    font = fonts.get_font(fontsize)
     for word in words:
-        width, _ = FONT.getsize(word)
+        width = font.width(word)
         length += width
         word_data.append(WordData(length, word))
         length = 0
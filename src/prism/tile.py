@@ -7,6 +7,7 @@ import importlib.resources
 import typing
 from prism.portal import Portal
 from prism.mapname import MapName
+from prism.assets import get_image_from_path
 from typing import Optional
 
 GREEN = sdl2.SDL_Color(50, 190, 50)
@@ -15,11 +16,6 @@ AQUA = sdl2.SDL_Color(30, 190, 210)
 FACTORY = sdl2.ext.SpriteFactory(sdl2.ext.SOFTWARE, free=False)
 
 
-def get_image_from_path(file_name: str) -> Image:
-    with importlib.resources.path('prism.resources', file_name) as path:
-        return Image.open(path)
-
-
 class Tile:
     image: Image
     walkable: bool